@@ -1,4 +1,101 @@
 #from  .patterndata import *
-from .heniautos import *
 
+# The calendar functions are loaded from heniautos.heniautos the first
+# time one of them is used, so importing the package (e.g. to print the
+# version) does not load modules or data it does not need.
 
+from importlib import import_module
+from .__version__ import __version__
+
+__all__ = [
+    "HeniautosError",
+    "HeniautosNoMatchError",
+    "HeniautosNoDataError",
+    "HeniautosNoDayInYearError",
+    "HeniautosDateNotFoundError",
+    "Seasons",
+    "MonthNameOptions",
+    "Cal",
+    "TZOptions",
+    "CalendarMonth",
+    "Months",
+    "ArgiveMonths",
+    "AthenianMonths",
+    "DelianMonths",
+    "DelphianMonths",
+    "CorinthianMonths",
+    "MacedonianMonths",
+    "GenericMonths",
+    "CALENDAR_MAP",
+    "MONTH_NAME_MAP",
+    "FestivalDay",
+    "PrytanyDay",
+    "FestivalYear",
+    "AstroData",
+    "DATA_FILES",
+    "load_data",
+    "clear_data_cache",
+    "set_data_files",
+    "bce_as_negative",
+    "negative_as_bce",
+    "arkhon_year",
+    "to_jdn",
+    "tz_offset",
+    "as_julian",
+    "as_gregorian",
+    "solar_event",
+    "observed_solar_event",
+    "new_moons",
+    "visible_new_moons",
+    "month_name",
+    "calendar_months",
+    "doy_gen",
+    "FestivalCacheInfo",
+    "enable_festival_cache",
+    "disable_festival_cache",
+    "clear_festival_cache",
+    "festival_cache_info",
+    "festival_calendar",
+    "festival_calendars",
+    "CalendarSweep",
+    "calendar_sweep",
+    "athenian_festival_calendar",
+    "delphian_festival_calendar",
+    "delian_festival_calendar",
+    "argive_festival_calendar",
+    "macedonian_festival_calendar",
+    "spartan_festival_calendar",
+    "corinthian_festival_calendar",
+    "jdn_to_festival_calendar",
+    "jdn_to_festival_day",
+    "jdns_to_festival_days",
+    "julian_to_festival_day",
+    "gregorian_to_festival_day",
+    "calendar_groups",
+    "by_months",
+    "festival_to_jdn",
+    "octaeteris_gen",
+    "octaeteris",
+    "octaeteris_calendars",
+    "version",
+    "CAL_RULES",
+    "CAL_FUNCTION_MAP",
+]
+
+
+def __getattr__(name):
+    # Only the public names are looked up, so that checking for a
+    # submodule (e.g. by "from heniautos import prytanies") does not
+    # load the calendar functions
+    if name not in __all__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(".heniautos", __name__), name)
+
+    # Later lookups find the attribute without calling __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,225 @@
+# heniautos. Ancient Athenian calendar generator
+# Copyright (C) 2021 Sean Redmond
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Festival calendars as NumPy arrays. Requires numpy (install
+heniautos[arrays])."""
+
+import numpy as np
+import heniautos as ha
+
+# One row per day, with the numerical members of FestivalDay
+DTYPE = np.dtype(
+    [
+        ("jdn", np.int64),
+        ("month_index", np.int8),
+        ("month", np.int8),
+        ("month_length", np.int8),
+        ("day", np.int8),
+        ("doy", np.int16),
+        ("year_length", np.int16),
+        ("astronomical_year", np.int32),
+    ]
+)
+
+
+def festival_array(
+    year1,
+    year2=None,
+    calendar=ha.Cal.GENERIC,
+    intercalate=6,
+    event=ha.Seasons.SUMMER_SOLSTICE,
+    before_event=False,
+    v_off=1,
+    s_off=0,
+    data=ha.load_data,
+    columns=False,
+):
+    """Return festival calendars for one or more years as an array.
+
+    :param year1: The first year
+    :type year1: int
+    :param year2: The last year, inclusive (default: year1)
+    :type year2: int
+    :param columns: Return a dict of arrays, one for each column,
+        instead of a structured array (default: False)
+    :type columns: bool
+    :return: One row for each day
+    :rtype: numpy.ndarray, dict
+
+    The other parameters are as for :py:func:`heniautos.festival_calendar`.
+
+    The columns, described by :py:data:`DTYPE`, are the numerical
+    members of :py:class:`heniautos.FestivalDay`. Month names and the
+    year as a string are not included. ``month`` is the value of the
+    month constant (e.g. :py:enum:`heniautos.AthenianMonths`), or 0 if
+    calendar is None.
+
+    The array is built from the starts of the months, without making
+    FestivalDay objects.
+    """
+    if year2 is None:
+        year2 = year1
+
+    if year2 < year1:
+        raise ValueError("year2 must not be earlier than year1")
+
+    years = list(
+        ha.festival_calendars(
+            year1,
+            year2,
+            calendar,
+            intercalate,
+            event=event,
+            before_event=before_event,
+            v_off=v_off,
+            s_off=s_off,
+            data=data,
+        )
+    )
+    months = _month_table(years, range(year1, year2 + 1))
+
+    # Years share their boundaries, so the days are one range
+    jdns = np.arange(months["start"][0], months["end"][-1], dtype=np.int64)
+    day_month = np.repeat(
+        np.arange(len(months["start"])), months["end"] - months["start"]
+    )
+
+    return _result(jdns, months, day_month, columns)
+
+
+def jdns_to_festival_array(
+    jdns,
+    calendar=ha.Cal.ATHENIAN,
+    intercalate=6,
+    v_off=1,
+    s_off=0,
+    data=ha.load_data,
+    columns=False,
+):
+    """Find the festival dates of many Julian Day Numbers as an array.
+
+    :param jdns: Julian Day Numbers
+    :type jdns: Sequence, numpy.ndarray
+    :param columns: Return a dict of arrays, one for each column,
+        instead of a structured array (default: False)
+    :type columns: bool
+    :return: One row for each JDN, in the same order
+    :rtype: numpy.ndarray, dict
+
+    The other parameters are as for
+    :py:func:`heniautos.jdn_to_festival_day`. The columns are the same
+    as for :py:func:`festival_array`. For JDNs without enough data to
+    find the date, ``month_index`` is 0, as are all the other columns
+    except ``jdn``.
+
+    The year containing the earliest JDN is found, and then the next
+    JDN after that year, and so on, so that the year and its months
+    are found only once. The JDNs are then looked up in the starts of
+    the months of those years with :py:func:`numpy.searchsorted`.
+    """
+    jdns = np.asarray(jdns, dtype=np.int64)
+    event, before_event = ha.CAL_RULES[calendar]
+    distinct = np.unique(jdns)
+
+    years = []
+    i = 0
+    while i < len(distinct):
+        try:
+            day = ha.jdn_to_festival_day(
+                int(distinct[i]),
+                calendar=calendar,
+                intercalate=intercalate,
+                v_off=v_off,
+                s_off=s_off,
+                data=data,
+            )
+        except ha.HeniautosError:
+            i += 1
+            continue
+
+        years.append(
+            next(
+                ha.festival_calendars(
+                    day.astronomical_year,
+                    day.astronomical_year,
+                    calendar,
+                    intercalate,
+                    event=event,
+                    before_event=before_event,
+                    v_off=v_off,
+                    s_off=s_off,
+                    data=data,
+                )
+            )
+        )
+        i = np.searchsorted(distinct, years[-1].starts[-1])
+
+    if not years:
+        return _result(jdns, None, np.full(len(jdns), -1), columns)
+
+    months = _month_table(years, [y.astronomical_year for y in years])
+    day_month = np.searchsorted(months["start"], jdns, side="right") - 1
+    day_month[(day_month < 0) | (jdns >= months["end"][day_month])] = -1
+
+    return _result(jdns, months, day_month, columns)
+
+
+def _month_table(years, astronomical_years):
+    """Return a dict of arrays describing each month of FestivalYears"""
+    counts = np.array([len(y.starts) - 1 for y in years])
+    first_month = np.repeat(np.cumsum(counts) - counts, counts)
+    year = np.repeat(np.arange(len(years)), counts)
+
+    return {
+        "start": np.array([s for y in years for s in y.starts[:-1]], dtype=np.int64),
+        "end": np.array([s for y in years for s in y.starts[1:]], dtype=np.int64),
+        "month_index": np.arange(len(year)) - first_month + 1,
+        "month": np.array(
+            [m for y in years for m in (y.months or [0] * (len(y.starts) - 1))],
+            dtype=np.int64,
+        ),
+        "year_start": np.array([y.starts[0] for y in years], dtype=np.int64)[year],
+        "year_length": np.array([len(y) for y in years])[year],
+        "astronomical_year": np.array(astronomical_years)[year],
+    }
+
+
+def _result(jdns, months, day_month, columns):
+    """Return the columns for the days in months (-1 if not found) of
+    jdns as a structured array or dict"""
+    found = day_month >= 0
+    cols = {name: np.zeros(len(jdns), dtype=DTYPE[name]) for name in DTYPE.names}
+    cols["jdn"][:] = jdns
+
+    if months is not None:
+        m = day_month[found]
+        j = jdns[found]
+        cols["month_index"][found] = months["month_index"][m]
+        cols["month"][found] = months["month"][m]
+        cols["month_length"][found] = (months["end"] - months["start"])[m]
+        cols["day"][found] = j - months["start"][m] + 1
+        cols["doy"][found] = j - months["year_start"][m] + 1
+        cols["year_length"][found] = months["year_length"][m]
+        cols["astronomical_year"][found] = months["astronomical_year"][m]
+
+    if columns:
+        return cols
+
+    arr = np.empty(len(jdns), dtype=DTYPE)
+    for name, col in cols.items():
+        arr[name] = col
+
+    return arr
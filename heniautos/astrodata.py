@@ -0,0 +1,474 @@
+# heniautos. Ancient Athenian calendar generator
+# Copyright (C) 2021 Sean Redmond
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from collections.abc import Mapping, Sequence
+import hashlib
+import juliandate as jd
+import mmap
+from pathlib import Path
+import struct
+import sys
+import threading
+
+# Binary data files start with a 40 byte header: magic number, format
+# version, two reserved bytes, the number of events, and the size and
+# digest of the file the events were converted from (zeros if they
+# were not). This is followed by a column of little-endian float64
+# Julian dates and a column of int8 event ids.
+BINARY_MAGIC = b"HNAD"
+BINARY_VERSION = 2
+BINARY_SUFFIX = ".bin"
+__header = struct.Struct("<4sHHQQ16s")
+__no_source = (0, bytes(16))
+
+
+class EventTable(Sequence):
+    """A sequence of (julian date, event id) pairs stored as two columns.
+
+    Behaves like the tuple of tuples previously returned for each kind
+    of astronomical data, but stores the Julian dates and event ids in
+    compact arrays (or in a memory-mapped file). The Julian dates must
+    be in ascending order.
+    """
+
+    __slots__ = ("jd", "event", "_years")
+
+    def __init__(self, jd, event):
+        if len(jd) != len(event):
+            raise ValueError("Columns must have the same length")
+
+        self.jd = jd
+        self.event = event
+        self._years = {}
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Make an EventTable from a sequence of (julian date, event id) pairs.
+
+        The rows are sorted by Julian date.
+        """
+        rows = sorted(rows, key=lambda r: r[0])
+        return cls(array("d", [r[0] for r in rows]), array("b", [r[1] for r in rows]))
+
+    def year_indices(self, year):
+        """Return the start and end (exclusive) indices of events in a year.
+
+        :param year: A Julian calendar year
+        :type year: int
+        :return: Indices of the first event in the year and the one
+            following the last
+        :rtype: tuple
+
+        The indices are found by bisection the first time a year is
+        requested and remembered after that.
+        """
+        try:
+            return self._years[year]
+        except KeyError:
+            bounds = (
+                bisect_left(self.jd, jd.from_julian(year, 1, 1)),
+                bisect_right(self.jd, jd.from_julian(year, 12, 31, 23, 59, 59)),
+            )
+            self._years[year] = bounds
+            return bounds
+
+    def year(self, year):
+        """Return the events in a Julian calendar year.
+
+        :param year: A Julian calendar year
+        :type year: int
+        :return: The events in the year
+        :rtype: EventTable
+        """
+        return self[slice(*self.year_indices(year))]
+
+    def __len__(self):
+        return len(self.jd)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return EventTable(self.jd[i], self.event[i])
+
+        return (self.jd[i], self.event[i])
+
+    def __iter__(self):
+        return zip(self.jd, self.event)
+
+    def __eq__(self, other):
+        if not isinstance(other, Sequence):
+            return NotImplemented
+
+        return len(self) == len(other) and all(
+            [tuple(a) == tuple(b) for a, b in zip(self, other)]
+        )
+
+    def __reduce__(self):
+        # Memory-mapped columns cannot be pickled, so send copies
+        return (EventTable, (array("d", self.jd), array("b", self.event)))
+
+    def __repr__(self):
+        return f"<EventTable of {len(self)} events>"
+
+    def select(self, event):
+        """Return only the events with the given id.
+
+        :param event: Event id (e.g. :py:enum:`heniautos.Seasons.SUMMER_SOLSTICE`)
+        :type event: int
+        :return: The matching events
+        :rtype: EventTable
+        """
+        keep = [i for i, e in enumerate(self.event) if e == event]
+        return EventTable(
+            array("d", [self.jd[i] for i in keep]), array("b", [event] * len(keep))
+        )
+
+    def years(self):
+        """Return the first and last Julian years with events, or None if empty."""
+        if not len(self):
+            return None
+
+        return (jd.to_julian(self.jd[0])[0], jd.to_julian(self.jd[-1])[0])
+
+
+def _as_table(events):
+    """Return events as an EventTable, converting other sequences."""
+    if isinstance(events, EventTable):
+        return events
+
+    return EventTable.from_rows(events)
+
+
+class AstroData(Mapping):
+    """Astronomical data for use by the calendar functions.
+
+    :param solstices: Solstice and equinox data
+    :type solstices: EventTable, Sequence
+    :param new_moons: New moon data
+    :type new_moons: EventTable, Sequence
+
+    Each kind of data is held in an :py:class:`EventTable`. Sequences
+    of (julian date, event id) pairs are converted. For compatibility
+    with code written for the dictionaries of tuples previously used
+    as data, an AstroData can be read like a dict with the keys
+    "solstices" and "new_moons".
+
+    Two AstroData objects with the same contents compare (and hash)
+    equal, so they can be used as cache keys. See :py:attr:`key`.
+    """
+
+    KINDS = ("solstices", "new_moons")
+
+    # Dicts recently converted by coerce(), keyed by id(). Each entry
+    # keeps the dict so that its id cannot be reused while it is cached
+    COERCE_CACHE_SIZE = 8
+    _coerced = OrderedDict()
+    _coerced_lock = threading.Lock()
+
+    def __init__(self, solstices=(), new_moons=()):
+        self.solstices = _as_table(solstices)
+        self.new_moons = _as_table(new_moons)
+        self._views = {}
+        self._key = None
+        self._new_moon_jdns = None
+
+    @classmethod
+    def coerce(cls, data):
+        """Return data as AstroData.
+
+        :param data: Astronomical data
+        :type data: AstroData, dict
+        :rtype: AstroData
+
+        AstroData is returned unchanged. Dicts with "solstices" and/or
+        "new_moons" are converted (missing kinds are empty).
+
+        Converting a dict copies and sorts all of its data and the
+        result has to be hashed again before it can be used as a cache
+        key, which costs about as much as loading the data. The last
+        :py:attr:`COERCE_CACHE_SIZE` dicts converted are therefore
+        remembered, and the same AstroData is returned for them as long
+        as the objects stored under "solstices" and "new_moons" are the
+        same. Changes made to those sequences in place are not noticed,
+        so convert data that will change to AstroData once instead of
+        passing the dict.
+        """
+        if isinstance(data, AstroData):
+            return data
+
+        parts = tuple(data.get(k, ()) for k in cls.KINDS)
+        with cls._coerced_lock:
+            hit = cls._coerced.get(id(data))
+            if hit is not None and all([a is b for a, b in zip(hit[1], parts)]):
+                cls._coerced.move_to_end(id(data))
+                return hit[2]
+
+        astro = cls(*parts)
+        with cls._coerced_lock:
+            cls._coerced[id(data)] = (data, parts, astro)
+            cls._coerced.move_to_end(id(data))
+            while len(cls._coerced) > cls.COERCE_CACHE_SIZE:
+                cls._coerced.popitem(last=False)
+
+        return astro
+
+    def __getitem__(self, kind):
+        if kind not in self.KINDS:
+            raise KeyError(kind)
+
+        return getattr(self, kind)
+
+    def __iter__(self):
+        return iter(self.KINDS)
+
+    def __len__(self):
+        return len(self.KINDS)
+
+    def events(self, kind, event):
+        """Return a view of one kind of data with only one event id.
+
+        :param kind: "solstices" or "new_moons"
+        :type kind: str
+        :param event: Event id (e.g. :py:enum:`heniautos.Seasons.SUMMER_SOLSTICE`)
+        :type event: int
+        :rtype: EventTable
+
+        Views are built the first time they are requested.
+        """
+        try:
+            return self._views[(kind, event)]
+        except KeyError:
+            view = self[kind].select(event)
+            self._views[(kind, event)] = view
+            return view
+
+    @property
+    def new_moon_jdns(self):
+        """The new moons rounded to Julian Day Numbers.
+
+        An array parallel to ``new_moons``, built the first time it is
+        used.
+        """
+        if self._new_moon_jdns is None:
+            self._new_moon_jdns = array("q", [int(t + 0.5) for t in self.new_moons.jd])
+
+        return self._new_moon_jdns
+
+    @property
+    def year_range(self):
+        """First and last Julian years for which there is data of both kinds.
+
+        None if either kind of data is empty. There may be gaps within
+        the range.
+        """
+        years = [self[k].years() for k in self.KINDS]
+        if None in years:
+            return None
+
+        return (max([y[0] for y in years]), min([y[1] for y in years]))
+
+    @property
+    def key(self):
+        """A digest of the data, identifying it in caches."""
+        if self._key is None:
+            digest = hashlib.blake2b(digest_size=16)
+            for kind in self.KINDS:
+                digest.update(kind.encode())
+                digest.update(self[kind].jd)
+                digest.update(self[kind].event)
+
+            self._key = digest.hexdigest()
+
+        return self._key
+
+    def __eq__(self, other):
+        if not isinstance(other, AstroData):
+            return NotImplemented
+
+        return self is other or self.key == other.key
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __reduce__(self):
+        return (AstroData, (self.solstices, self.new_moons))
+
+    def __repr__(self):
+        return (
+            f"<AstroData {len(self.solstices)} solar events, "
+            f"{len(self.new_moons)} new moons>"
+        )
+
+
+def load_tsv(fn):
+    """Load astronomical data from a tab-delimited file.
+
+    :param fn: Path to the file
+    :type fn: str, Path
+    :return: The events in the file
+    :rtype: EventTable
+
+    Each line should contain a julian date (float) and an event/phase
+    id (int).
+    """
+    jds = array("d")
+    events = array("b")
+    with open(fn) as data:
+        for line in data:
+            j, e = line.split("\t")
+            jds.append(float(j))
+            events.append(int(e))
+
+    return EventTable(jds, events)
+
+
+def load_binary(fn):
+    """Memory-map astronomical data from a binary file.
+
+    :param fn: Path to the file
+    :type fn: str, Path
+    :return: The events in the file
+    :rtype: EventTable
+
+    The columns of the returned EventTable are views of the mapped
+    file, so the data is only paged in as it is used and can be shared
+    between processes.
+    """
+    with open(fn, "rb") as f:
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    view = memoryview(buf)
+    count = __read_header(view, fn)[0]
+    jd_end = __header.size + count * 8
+    if len(view) != jd_end + count:
+        raise ValueError(f"{fn} is truncated or corrupt")
+
+    jds = view[__header.size : jd_end].cast("d")
+    events = view[jd_end:].cast("b")
+
+    if sys.byteorder != "little":
+        jds = array("d", jds)
+        jds.byteswap()
+
+    return EventTable(jds, events)
+
+
+def __read_header(view, fn):
+    """Return the number of events and the size and digest of the
+    source file from the header of a binary file."""
+    if len(view) < __header.size:
+        raise ValueError(f"{fn} is not a heniautos data file")
+
+    magic, version, _, count, size, digest = __header.unpack_from(view)
+    if magic != BINARY_MAGIC:
+        raise ValueError(f"{fn} is not a heniautos data file")
+
+    if version != BINARY_VERSION:
+        raise ValueError(f"Unsupported data file version {version} in {fn}")
+
+    return (count, size, digest)
+
+
+def __file_digest(fn):
+    """Return the size and digest of a file."""
+    content = Path(fn).read_bytes()
+    return (len(content), hashlib.blake2b(content, digest_size=16).digest())
+
+
+def write_binary(events, fn, source=None):
+    """Write astronomical data to a binary file.
+
+    :param events: (julian date, event id) pairs
+    :type events: EventTable, Sequence
+    :param fn: Path to the file
+    :type fn: str, Path
+    :param source: File the events were read from, if any (default: None)
+    :type source: str, Path
+
+    The size and digest of source are recorded so that
+    :py:func:`load_events` can tell whether it has changed since.
+    """
+    table = events if isinstance(events, EventTable) else EventTable.from_rows(events)
+    jds = array("d", table.jd)
+    if sys.byteorder != "little":
+        jds.byteswap()
+
+    size, digest = __no_source if source is None else __file_digest(source)
+    with open(fn, "wb") as f:
+        f.write(
+            __header.pack(BINARY_MAGIC, BINARY_VERSION, 0, len(table), size, digest)
+        )
+        f.write(jds.tobytes())
+        f.write(array("b", table.event).tobytes())
+
+
+def tsv_to_binary(tsv, fn=None):
+    """Convert a tab-delimited data file to the binary format.
+
+    :param tsv: Path to the tab-delimited file
+    :type tsv: str, Path
+    :param fn: Path to the binary file (default: tsv with the suffix .bin)
+    :type fn: str, Path
+    :return: Path to the binary file
+    :rtype: Path
+    """
+    out = Path(tsv).with_suffix(BINARY_SUFFIX) if fn is None else Path(fn)
+    write_binary(load_tsv(tsv), out, source=tsv)
+    return out
+
+
+def __binary_is_current(binary, tsv):
+    """Return True if binary was converted from tsv as it is now, or
+    was not converted from a file at all."""
+    try:
+        with open(binary, "rb") as f:
+            _, size, digest = __read_header(f.read(__header.size), binary)
+    except ValueError:
+        return False
+
+    if (size, digest) == __no_source:
+        return True
+
+    return size == Path(tsv).stat().st_size and (size, digest) == __file_digest(tsv)
+
+
+def load_events(fn):
+    """Load astronomical data, preferring the binary format.
+
+    :param fn: Path to a tab-delimited or binary file
+    :type fn: str, Path
+    :return: The events in the file
+    :rtype: EventTable
+
+    If fn is a tab-delimited file with a binary file of the same name
+    (but with the suffix .bin) beside it, the binary file is loaded
+    instead. A binary file made by :py:func:`tsv_to_binary` is only
+    used if the tab-delimited file has the same size and digest as
+    when it was converted, so edits to it are never ignored. Hashing
+    the file is much faster than parsing it. Binary files of another
+    version are ignored.
+    """
+    path = Path(fn)
+    if path.suffix == BINARY_SUFFIX:
+        return load_binary(path)
+
+    binary = path.with_suffix(BINARY_SUFFIX)
+    if binary.exists() and __binary_is_current(binary, path):
+        return load_binary(binary)
+
+    return load_tsv(path)
@@ -19,6 +19,7 @@
 import argparse
 import csv
 from datetime import datetime
+from functools import lru_cache
 import heniautos as ha
 import heniautos.prytanies as pryt
 import heniautos.equations as heq
@@ -26,21 +27,12 @@ from itertools import product
 import sys
 
 
-# Conversions for argument parameters to Months constants
-CMD_MONTHS = {
-    "hek": ha.AthenianMonths.HEK,
-    "met": ha.AthenianMonths.MET,
-    "boe": ha.AthenianMonths.BOE,
-    "pua": ha.AthenianMonths.PUA,
-    "mai": ha.AthenianMonths.MAI,
-    "pos": ha.AthenianMonths.POS,
-    "gam": ha.AthenianMonths.GAM,
-    "ant": ha.AthenianMonths.ANT,
-    "ela": ha.AthenianMonths.ELA,
-    "mou": ha.AthenianMonths.MOU,
-    "tha": ha.AthenianMonths.THA,
-    "ski": ha.AthenianMonths.SKI,
-}
+# Conversions for argument parameters to Months constants. Built when
+# first needed so that the calendar functions are only loaded if used
+@lru_cache(maxsize=None)
+def cmd_months():
+    return {m.name.lower(): m for m in ha.AthenianMonths}
+
 
 # Conversions for argument parameters to Prytanies constants
 CMD_PRYT = {
@@ -65,7 +57,7 @@ def abbrev_from_constant(val, dct):
 
 
 def month_abbrev_from_constant(m):
-    return abbrev_from_constant(m, CMD_MONTHS).title()
+    return abbrev_from_constant(m, cmd_months()).title()
 
 
 def prytany_abbrev_from_constant(p):
@@ -236,7 +228,7 @@ def cmd_parse_abbrevs(month, day, abbrevs, pryt_type=None, year=None):
     try:
 
         months = cmd_parse_month_or_prytany(month, abbrevs)
-        days = cmd_parse_days(day, abbrevs == CMD_MONTHS, pryt_type, year)
+        days = cmd_parse_days(day, abbrevs is cmd_months(), pryt_type, year)
 
         return tuple(product(months, days))
     except KeyError as e:
@@ -255,7 +247,7 @@ def cmd_parse_abbrevs(month, day, abbrevs, pryt_type=None, year=None):
 
 
 def cmd_parse_festival(month, day):
-    return cmd_parse_abbrevs(month, day, CMD_MONTHS)
+    return cmd_parse_abbrevs(month, day, cmd_months())
 
 
 def cmd_parse_conciliar(prytany, day, pryt_type, year):
@@ -335,7 +327,7 @@ under certain conditions.""",
     parser.add_argument(
         "--version",
         action="version",
-        version=f"heniautos {ha.version()}",
+        version=f"heniautos {ha.__version__}",
         help="Print version and exit",
     )
     args = parser.parse_args()
@@ -40,12 +40,9 @@ ROMAN = (
     "XIII",
 )
 
-SOLAR = {
-    ha.Seasons.SPRING_EQUINOX: "SpEq",
-    ha.Seasons.SUMMER_SOLSTICE: "SuSo",
-    ha.Seasons.AUTUMN_EQUINOX: "AuEq",
-    ha.Seasons.WINTER_SOLSTICE: "WiSo",
-}
+# Abbreviations for solar events, indexed by ha.Seasons (spring equinox,
+# summer solstice, autumn equinox, winter solstice)
+SOLAR = ("SpEq", "SuSo", "AuEq", "WiSo")
 
 
 def adj_time(args):
@@ -437,7 +434,13 @@ def maybe_load_from_ephemeris(args):
             )
         )
 
-        return lambda: heph.get_ephemeris_data(cal_years[0], cal_years[-1], eph_cfg)
+        data = heph.get_ephemeris_data(
+            cal_years[0],
+            cal_years[-1],
+            eph_cfg,
+            cache_dir=None if args.no_cache else heph.default_cache_dir(),
+        )
+        return lambda: data
 
     return ha.load_data
 
@@ -590,6 +593,11 @@ under certain conditions.""",
         help="Use existing ephemeris FILE (if it cannot " "automatically be found)",
         default=None,
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not save or reuse ephemeris calculations (with -E)",
+    )
     parser.add_argument(
         "--julian", action="store_true", help="Just output Julian calendar dates"
     ),
@@ -609,7 +617,7 @@ under certain conditions.""",
     parser.add_argument(
         "--version",
         action="version",
-        version=f"heniautos {ha.version()}",
+        version=f"heniautos {ha.__version__}",
         help="Print version and exit",
     )
     args = parser.parse_args()
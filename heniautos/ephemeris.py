@@ -1,7 +1,43 @@
 from skyfield import api
 from skyfield import almanac
 from skyfield.api import GREGORIAN_START
+from skyfield.errors import EphemerisRangeError
+from array import array
+from concurrent.futures import ProcessPoolExecutor
 from enum import IntEnum
+import hashlib
+import juliandate as jd
+import math
+import numpy
+import os
+from pathlib import Path
+from heniautos.astrodata import AstroData, EventTable, load_binary, write_binary
+
+# Ephemeris calculations are done (and cached) in blocks of this many years
+CACHE_BLOCK = 10
+
+# Change when the results of calculations (or the format of the
+# cached files) change so that old cached results are not used
+CACHE_VERSION = 3
+
+# Days added to either end of a search for events
+SEARCH_PAD = 1.0
+
+# Days by which searches are kept within the dates covered by the
+# ephemeris, which cannot calculate apparent positions right up to its
+# ends because of the travel time of light
+EPHEMERIS_MARGIN = 0.01
+
+# Mean synodic month and the time (TT) of a mean new moon, for
+# estimating the times of lunar phases (Meeus, Astronomical
+# Algorithms, ch. 49)
+SYNODIC_MONTH = 29.530588861
+MEAN_NEW_MOON = 2451550.09766
+
+# Precision (in days) and maximum number of iterations for refining
+# the times of lunar phases
+PHASE_EPSILON = 0.001 / 86400
+PHASE_ITERATIONS = 20
 
 class Phases(IntEnum):
     """Constants representing lunar phases."""
@@ -45,6 +81,8 @@ def init_ephemeris(cfg={}, eph="de422.bsp", lat=37.983972, lon=23.727806, force=
     cfg["ts"] = api.load.timescale()
     cfg["ts"].julian_calendar_cutoff = GREGORIAN_START
     cfg["loc"] = api.wgs84.latlon(lat, lon)
+    cfg["lat"] = lat
+    cfg["lon"] = lon
     cfg["init"] = True
 
     return cfg
@@ -58,53 +96,294 @@ def __delta_t(t, delta_t):
 
     return t.tt
 
+
+def _coverage(eph):
+    """Return the first and last TT Julian dates for which events can be
+    calculated with the ephemeris."""
+    segments = [s.spk_segment for s in eph["eph"].segments]
+    return (
+        max([s.start_jd for s in segments]) + EPHEMERIS_MARGIN,
+        min([s.end_jd for s in segments]) - EPHEMERIS_MARGIN,
+    )
+
+
+def __find_in_years(year1, year2, eph, f):
+    """Find the discrete events of f in the Julian years year1 to
+    year2 (inclusive).
+
+    The search is padded at both ends so that events close to the
+    boundaries are found reliably, and the results are then trimmed
+    to the requested years. The search is limited to the dates
+    covered by the ephemeris.
+    """
+    start = eph["ts"].tt_jd(jd.from_julian(year1, 1, 1))
+    end = eph["ts"].tt_jd(jd.from_julian(year2 + 1, 1, 1))
+    first, last = _coverage(eph)
+    search = (max(start.tt - SEARCH_PAD, first), min(end.tt + SEARCH_PAD, last))
+    if search[0] >= search[1]:
+        return []
+
+    return [
+        e
+        for e in zip(
+            *almanac.find_discrete(
+                eph["ts"].tt_jd(search[0]), eph["ts"].tt_jd(search[1]), f
+            )
+        )
+        if start.tt <= e[0].tt < end.tt
+    ]
+
+
 def _solar_events(year1, year2, eph, delta_t):
+    """Return solstices and equinoxes in the years year1 to year2 (inclusive)."""
     return tuple(
         [
-            (__delta_t(s[0], delta_t), s[1])
-            for s in zip(
-                *almanac.find_discrete(
-                    eph["ts"].ut1(year1, 1, 31),
-                    eph["ts"].ut1(year2, 12, 31),
-                    almanac.seasons(eph["eph"]),
-                )
-            )
+            (__delta_t(s[0], delta_t), int(s[1]))
+            for s in __find_in_years(year1, year2, eph, almanac.seasons(eph["eph"]))
         ]
     )
 
 
-def _get_solar_events(year1, year2=None, eph={}, delta_t=True):
-    if year2 is not None:
-        return _solar_events(year1 - 1, year2 + 1, eph, delta_t)
+def __phase_offset(t, eph, phase):
+    """Return the difference in degrees (-180 to 180) between the Moon's
+    phase angle at TT Julian dates t and the angle of the requested
+    phase."""
+    angle = almanac.moon_phase(eph["eph"], eph["ts"].tt_jd(t)).degrees
+    return (angle - phase * 90.0 + 180.0) % 360.0 - 180.0
 
-    return _solar_events(year1 - 1, year1 + 1, eph, delta_t)
+
+def __find_phase(start, end, eph, phase):
+    """Return the times of one lunar phase between TT Julian dates start
+    (inclusive) and end (exclusive).
+
+    Rather than searching for every change of phase, each occurrence
+    of the requested phase is found directly. The search starts from
+    the phase's mean time, which is within a day of the true time, and
+    is refined by the secant method on the difference between the
+    ecliptic longitudes of the Moon and the Sun. All occurrences are
+    refined together, so every iteration is a single (vectorized)
+    ephemeris calculation. Only times covered by the ephemeris are
+    searched.
+    """
+    mean_rate = 360.0 / SYNODIC_MONTH
+    lunations = numpy.arange(
+        math.floor((start - MEAN_NEW_MOON) / SYNODIC_MONTH) - 1,
+        math.ceil((end - MEAN_NEW_MOON) / SYNODIC_MONTH) + 2,
+    )
+
+    first, last = _coverage(eph)
+    t0 = MEAN_NEW_MOON + SYNODIC_MONTH * (lunations + phase / 4.0)
+    t0 = t0[(t0 >= first) & (t0 <= last)]
+    if not len(t0):
+        return eph["ts"].tt_jd(t0)
+
+    f0 = __phase_offset(t0, eph, phase)
+    t1 = numpy.clip(t0 - f0 / mean_rate, first, last)
+
+    for _ in range(PHASE_ITERATIONS):
+        f1 = __phase_offset(t1, eph, phase)
+        dt = t1 - t0
+        rate = numpy.divide(
+            f1 - f0, dt, out=numpy.full_like(f1, mean_rate), where=dt != 0
+        )
+
+        # The Moon always gains on the Sun, so a rate that is not
+        # positive can only be rounding error
+        step = f1 / numpy.where(rate > 0, rate, mean_rate)
+        t0, f0, t1 = t1, f1, numpy.clip(t1 - step, first, last)
+
+        if numpy.max(numpy.abs(step)) < PHASE_EPSILON:
+            break
+
+    # Phases beyond the ends of the ephemeris are left at the ends
+    found = (t1 >= start) & (t1 < end) & (t1 > first) & (t1 < last)
+    return eph["ts"].tt_jd(t1[found])
 
 
 def _moon_phases(year1, year2, eph={}, phase=0, delta_t=True):
-    """Return Time objects for all moon phases in year y."""
+    """Return moon phases of the type phase in the years year1 to year2
+    (inclusive)."""
     return tuple(
         [
-            (__delta_t(p[0], delta_t), p[1])
-            for p in zip(
-                *almanac.find_discrete(
-                    eph["ts"].ut1(year1, 1, 1),
-                    eph["ts"].ut1(year2, 12, 31, 23, 59, 59),
-                    almanac.moon_phases(eph["eph"]),
+            (float(t), int(phase))
+            for t in numpy.atleast_1d(
+                __delta_t(
+                    __find_phase(
+                        jd.from_julian(year1, 1, 1),
+                        jd.from_julian(year2 + 1, 1, 1),
+                        eph,
+                        phase,
+                    ),
+                    delta_t,
                 )
             )
-            if p[1] == phase
         ]
     )
 
 
-def _get_new_moons(year1, year2=None, eph={}, phase=0, delta_t=True):
-    if year2 is not None:
-        return _moon_phases(year1 - 1, year2 + 1, eph, phase, delta_t)
+def default_cache_dir():
+    """Return the default directory for cached ephemeris calculations.
+
+    :return: Path of the directory
+    :rtype: Path
+
+    This is the value of the environment variable HENIAUTOS_CACHE if
+    it is set, otherwise heniautos/ in XDG_CACHE_HOME (default ~/.cache).
+    """
+    if os.environ.get("HENIAUTOS_CACHE"):
+        return Path(os.environ["HENIAUTOS_CACHE"])
+
+    return Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "heniautos"
+
+
+def _cache_path(eph, delta_t, cache_dir):
+    """Return the cache directory for a combination of ephemeris file,
+    ΔT option and location."""
+    eph_path = Path(eph["eph_path"]).resolve()
+    stat = eph_path.stat()
+    identity = repr(
+        (
+            CACHE_VERSION,
+            str(eph_path),
+            stat.st_size,
+            stat.st_mtime_ns,
+            bool(delta_t),
+            eph.get("lat"),
+            eph.get("lon"),
+        )
+    )
+    return Path(cache_dir) / hashlib.sha1(identity.encode()).hexdigest()[:20]
+
 
-    return _moon_phases(year1 - 1, year1 + 1, eph, phase, delta_t)
+def _blocks(year1, year2):
+    """Return the first and last years of each block overlapping year1 to year2."""
+    return [
+        (b * CACHE_BLOCK, b * CACHE_BLOCK + CACHE_BLOCK - 1)
+        for b in range(year1 // CACHE_BLOCK, year2 // CACHE_BLOCK + 1)
+    ]
 
 
-def get_ephemeris_data(year1, year2=None, eph=None, delta_t=True):
+def _block_events(kind, block, eph, delta_t):
+    """Calculate the events of one kind ("solstices" or "new_moons")
+    for a block of years."""
+    if kind == "solstices":
+        return EventTable.from_rows(_solar_events(*block, eph, delta_t))
+
+    return EventTable.from_rows(_moon_phases(*block, eph, Phases.NEW, delta_t))
+
+
+# Ephemeris loaded in a worker process by _init_worker
+_worker_eph = None
+
+
+def _init_worker(eph_file, location):
+    """Load the ephemeris once in each worker process."""
+    global _worker_eph
+    _worker_eph = init_ephemeris({}, eph=eph_file, **location)
+
+
+def _worker_block_events(task):
+    """Calculate a (kind, block, delta_t) task in a worker process."""
+    kind, block, delta_t = task
+    return _block_events(kind, block, _worker_eph, delta_t)
+
+
+def _calculate_blocks(tasks, eph, workers=None):
+    """Calculate a list of (kind, block, delta_t) tasks.
+
+    With more than one worker, the tasks are divided among a pool of
+    processes, each of which loads the ephemeris once. Results are
+    returned in the order of the tasks.
+    """
+    if workers is None or workers < 2 or len(tasks) < 2:
+        return [_block_events(kind, block, eph, d) for kind, block, d in tasks]
+
+    location = {k: eph[k] for k in ("lat", "lon") if k in eph}
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(tasks)),
+        initializer=_init_worker,
+        initargs=(str(eph["eph_path"]), location),
+    ) as pool:
+        return list(pool.map(_worker_block_events, tasks))
+
+
+def _save_block(fn, events):
+    """Save a calculated block to the cache."""
+    fn.parent.mkdir(parents=True, exist_ok=True)
+
+    # Write to a temporary file first so that other processes never see
+    # a partially written block
+    tmp = fn.with_name(f"{fn.name}.{os.getpid()}.tmp")
+    write_binary(events, tmp)
+    os.replace(tmp, fn)
+
+
+def _join_blocks(tables, year1, year2):
+    """Concatenate the EventTables of consecutive blocks and trim them
+    to the years year1 to year2 (inclusive)."""
+    jds = array("d")
+    events = array("b")
+    for table in tables:
+        jds.frombytes(memoryview(table.jd).tobytes())
+        events.frombytes(memoryview(table.event).tobytes())
+
+    table = EventTable(jds, events)
+    return table[table.year_indices(year1)[0] : table.year_indices(year2)[1]]
+
+
+def _get_events(year1, year2, eph, delta_t, cache_dir=None, workers=None):
+    """Return a dict of EventTables of solar events and new moons in
+    the years year1 to year2 (inclusive)."""
+    # Blocks are only calculated as far as the ends of the ephemeris,
+    # but the years themselves must be covered
+    first, last = [eph["ts"].tt_jd(t) for t in _coverage(eph)]
+    span = numpy.array([jd.from_julian(year1, 1, 1), jd.from_julian(year2 + 1, 1, 1)])
+    outside = (span < first.tt) | (span > last.tt)
+    if outside.any():
+        raise EphemerisRangeError(
+            f"ephemeris only covers dates {first.utc_strftime('%Y-%m-%d')} "
+            f"through {last.utc_strftime('%Y-%m-%d')}",
+            first,
+            last,
+            outside,
+            eph["eph"].segments[0],
+        )
+
+    cache = None if cache_dir is None else _cache_path(eph, delta_t, cache_dir)
+
+    # Include the neighbouring years in case ΔT moves an event across
+    # the boundary of a block
+    blocks = _blocks(year1 - 1, year2 + 1)
+
+    tables = {}
+    if cache is not None:
+        for kind in AstroData.KINDS:
+            for block in blocks:
+                if (cache / f"{kind}_{block[0]}.bin").exists():
+                    tables[(kind, block)] = load_binary(
+                        cache / f"{kind}_{block[0]}.bin"
+                    )
+
+    tasks = [
+        (kind, block, delta_t)
+        for kind in AstroData.KINDS
+        for block in blocks
+        if (kind, block) not in tables
+    ]
+    for task, events in zip(tasks, _calculate_blocks(tasks, eph, workers)):
+        tables[task[:2]] = events
+        if cache is not None:
+            _save_block(cache / f"{task[0]}_{task[1][0]}.bin", events)
+
+    return {
+        kind: _join_blocks([tables[(kind, b)] for b in blocks], year1, year2)
+        for kind in AstroData.KINDS
+    }
+
+
+def get_ephemeris_data(
+    year1, year2=None, eph=None, delta_t=True, cache_dir=None, workers=None
+):
     """Get data for use by calendar functions
 
     :param year1: Year or start year for data
@@ -113,18 +392,42 @@ def get_ephemeris_data(year1, year2=None, eph=None, delta_t=True):
     :type year2: int
     :param eph: initialized ephemeris
     :type eph: dict
+    :param delta_t: Apply ΔT to the calculated times (default: True)
+    :type delta_t: bool
+    :param cache_dir: Directory in which to cache calculations (default: None, no caching)
+    :type cache_dir: str, Path
+    :param workers: Number of processes for calculations (default: None, calculate in this process)
+    :type workers: int
     :returns: A data object for use by calendar functions
-    :rtype: dict
+    :rtype: AstroData
 
     The `eph` parameter should be a dict as returned by
     :func:`init_ephemeris`. For `year1` or a span of `year1` to
-    `year2` (inclusive), returns a dictionary containg the dates of
-    solar events (solstices and equinoxes), and new moons, suitable to
-    be passed as the `data` parameter of calendar functions.
+    `year2` (inclusive), returns an :py:class:`AstroData` containg the
+    dates of solar events (solstices and equinoxes), and new moons,
+    suitable to be passed as the `data` parameter of calendar
+    functions. The data includes the years before `year1` and after
+    `year2`.
+
+    Calculations are done in blocks of :py:data:`CACHE_BLOCK`
+    years. If `cache_dir` is given (see :func:`default_cache_dir`),
+    each block is saved there in the binary data format and loaded
+    from there by later calls, including calls for other, overlapping
+    spans of years. Cached blocks are specific to the ephemeris file
+    (its path, size and modification time), the `delta_t` option, and
+    the location given to :func:`init_ephemeris`. Blocks at the ends
+    of the ephemeris are only calculated as far as it goes, but
+    ``EphemerisRangeError`` is raised if the ephemeris does not cover
+    all of the years of the data.
+
+    With `workers` greater than 1, blocks that are not cached are
+    calculated in parallel by that many processes. Since the blocks
+    are the same however they are calculated, the results are
+    identical to calculating them in a single process.
 
     """
+    last = year1 if year2 is None else year2
 
-    return {
-        "solstices": _get_solar_events(year1, year2, eph, delta_t),
-        "new_moons": _get_new_moons(year1, year2, eph, 0, delta_t),
-    }
+    return AstroData(
+        **_get_events(year1 - 1, last + 1, eph, delta_t, cache_dir, workers)
+    )
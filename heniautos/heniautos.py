@@ -16,14 +16,20 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-from collections import namedtuple
+from bisect import bisect_right
+from collections import namedtuple, OrderedDict
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
 
 # from datetime import datetime
 from enum import IntEnum, Enum  # , auto
-from itertools import groupby, product  # , zip_longest
+from itertools import count, groupby, product  # , zip_longest
 import juliandate as jd
 from pathlib import Path
+import threading
+import weakref
 from heniautos.__version__ import __version__
+from heniautos.astrodata import AstroData, load_events
 
 
 class HeniautosError(Exception):
@@ -364,6 +370,125 @@ PrytanyDay = namedtuple(
 )
 
 
+class FestivalYear(Sequence):
+    """A festival calendar year, as a sequence of FestivalDay objects.
+
+    Parameters:
+    starts (tuple) -- JDNs of the first day of each month, followed by
+    the first day of the next year
+    months (tuple) -- Month constants for each month, or None for a
+    generic calendar
+    month_names (tuple) -- Month name for each month (None if months is None)
+    year (str) -- The year as a string, e.g. "BCE 411/410" (None if
+    months is None)
+    astronomical_year (int) -- The year as an integer (None if months
+    is None)
+
+    Only the months are stored. The FestivalDay objects are made as
+    they are needed when indexing or iterating, so a FestivalYear can
+    be used like the tuple returned by festival_calendar with a small
+    fraction of the memory. tuple() converts it to that tuple.
+
+    """
+
+    __slots__ = ("starts", "months", "month_names", "year", "astronomical_year")
+
+    def __init__(
+        self, starts, months=None, month_names=None, year=None, astronomical_year=None
+    ):
+        self.starts = tuple(starts)
+        self.months = months
+        self.month_names = month_names
+        self.year = year
+        self.astronomical_year = astronomical_year
+
+    def __len__(self):
+        return self.starts[-1] - self.starts[0]
+
+    def __day(self, m, jdn, doy):
+        """Return the FestivalDay for jdn, in the month with index m"""
+        start = self.starts[m]
+        if self.months is None:
+            return FestivalDay(
+                jdn,
+                None,
+                m + 1,
+                None,
+                self.starts[m + 1] - start,
+                jdn - start + 1,
+                doy,
+                None,
+                None,
+                None,
+            )
+
+        return FestivalDay(
+            jdn,
+            self.month_names[m],
+            m + 1,
+            self.months[m],
+            self.starts[m + 1] - start,
+            jdn - start + 1,
+            doy,
+            self.year,
+            len(self),
+            self.astronomical_year,
+        )
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return tuple([self[d] for d in range(*i.indices(len(self)))])
+
+        if i < 0:
+            i += len(self)
+
+        if not 0 <= i < len(self):
+            raise IndexError("FestivalYear index out of range")
+
+        jdn = self.starts[0] + i
+        return self.__day(bisect_right(self.starts, jdn) - 1, jdn, i + 1)
+
+    def __iter__(self):
+        doy = 1
+        for m in range(len(self.starts) - 1):
+            for jdn in range(self.starts[m], self.starts[m + 1]):
+                yield self.__day(m, jdn, doy)
+                doy += 1
+
+    def __eq__(self, other):
+        if isinstance(other, FestivalYear):
+            return (
+                self.starts == other.starts
+                and self.months == other.months
+                and self.month_names == other.month_names
+                and self.year == other.year
+                and self.astronomical_year == other.astronomical_year
+            )
+
+        if not isinstance(other, Sequence) or isinstance(other, str):
+            return NotImplemented
+
+        return len(self) == len(other) and all([a == b for a, b in zip(self, other)])
+
+    def __hash__(self):
+        return hash(tuple(self))
+
+    def __reduce__(self):
+        return (
+            FestivalYear,
+            (
+                self.starts,
+                self.months,
+                self.month_names,
+                self.year,
+                self.astronomical_year,
+            ),
+        )
+
+    def __repr__(self):
+        return f"<FestivalYear {self.year or self.starts[0]}, {len(self)} days>"
+
+
 def __load_data_file(fn):
     """Load astronomical data from file fn
 
@@ -373,33 +498,99 @@ def __load_data_file(fn):
     2 = Autumn Equinox, 3 = Winter Solstice
 
     Lunar phase ids are:  0 = New Moon, 1 = First Quarter, 2 = Full Moon, 4 = Last Quarter
+
+    If a binary version of the file (same name, with the suffix .bin)
+    exists, it is memory-mapped instead of parsing the text file. See
+    :py:mod:`heniautos.astrodata`.
     """
-    with open(fn) as data:
-        return tuple(
-            [
-                tuple([i[0](i[1]) for i in zip((float, int), l.strip().split("\t"))])
-                for l in data
-            ]
-        )
+    return load_events(fn)
 
 
-def load_data(
-    solstices=Path(__file__).parent / "solstices.tsv",
-    new_moons=Path(__file__).parent / "new_moons.tsv",
-):
-    """Load solstice/equinox and moon phase data from files."""
-    return {
-        "solstices": __load_data_file(solstices),
-        "new_moons": __load_data_file(new_moons),
-    }
+DATA_FILES = {
+    "solstices": Path(__file__).parent / "solstices.tsv",
+    "new_moons": Path(__file__).parent / "new_moons.tsv",
+}
+
+__data_files = dict(DATA_FILES)
+__data_cache = {}
+__data_lock = threading.Lock()
+
+
+def load_data(solstices=None, new_moons=None):
+    """Load solstice/equinox and moon phase data from files.
+
+    :param solstices: Path to solstice/equinox data (default: the
+        current default file, see :py:func:`set_data_files`)
+    :type solstices: str, Path
+    :param new_moons: Path to new moon data (default: the current
+        default file, see :py:func:`set_data_files`)
+    :type new_moons: str, Path
+    :return: Astronomical data for calculations
+    :rtype: AstroData
+
+    Each pair of files is only read and parsed once per process. The
+    parsed data is shared by all later calls (including the default
+    ``data=load_data`` parameter of the calendar functions) until
+    :py:func:`clear_data_cache` is called.
+
+    """
+    key = (
+        str(__data_files["solstices"] if solstices is None else solstices),
+        str(__data_files["new_moons"] if new_moons is None else new_moons),
+    )
+
+    data = __data_cache.get(key)
+    if data is None:
+        with __data_lock:
+            # Another thread may have loaded the files while we waited
+            data = __data_cache.get(key)
+            if data is None:
+                data = AstroData(
+                    solstices=__load_data_file(key[0]),
+                    new_moons=__load_data_file(key[1]),
+                )
+                __data_cache[key] = data
+
+    return data
+
+
+def clear_data_cache():
+    """Discard all astronomical data loaded by :py:func:`load_data`.
+
+    The files will be read again the next time they are needed.
+    """
+    with __data_lock:
+        __data_cache.clear()
+
+
+def set_data_files(solstices=None, new_moons=None):
+    """Change the files used by default by :py:func:`load_data`.
+
+    :param solstices: Path to solstice/equinox data
+    :type solstices: str, Path
+    :param new_moons: Path to new moon data
+    :type new_moons: str, Path
+
+    Parameters that are None are reset to the data files distributed
+    with heniautos. The data cache is cleared.
+    """
+    with __data_lock:
+        __data_files["solstices"] = (
+            DATA_FILES["solstices"] if solstices is None else solstices
+        )
+        __data_files["new_moons"] = (
+            DATA_FILES["new_moons"] if new_moons is None else new_moons
+        )
+        __data_cache.clear()
 
 
 def __optionally_load_data(data):
-    """Return result of function call if param is a function, or the param."""
+    """Return result of function call if param is a function, or the
+    param, as AstroData."""
     if callable(data):
-        return data()
+        return AstroData.coerce(data())
 
-    return data
+    return AstroData.coerce(data)
 
 
 def __is_bce(t):
@@ -594,13 +785,9 @@ def solar_event(year, e, data=load_data):
 
     """
     try:
-        d1 = jd.from_julian(year, 1, 1)
-        d2 = jd.from_julian(year, 12, 31, 23, 59, 59)
-        return [
-            s[0]
-            for s in __optionally_load_data(data)["solstices"]
-            if s[1] == e and d1 <= s[0] <= d2
-        ][0]
+        return (
+            __optionally_load_data(data).events("solstices", e).year(year).jd[0]
+        )
     except IndexError:
         if year < 1:
             raise HeniautosNoDataError(
@@ -623,13 +810,9 @@ def new_moons(year, data=load_data):
     data -- Astronomical data for calculations. By default this is
     returned from load_data()
     """
-    d1 = jd.from_julian(year, 1, 1)
-    d2 = jd.from_julian(year, 12, 31, 23, 59, 59)
-    phases = [
-        m[0] for m in __optionally_load_data(data)["new_moons"] if d1 <= m[0] <= d2
-    ] or None
+    phases = tuple(__optionally_load_data(data).new_moons.year(year).jd)
     if phases:
-        return tuple(phases)
+        return phases
 
     raise HeniautosNoDataError(f"No data for the year {year}")
 
@@ -653,7 +836,12 @@ def visible_new_moons(year, v_off=1, data=load_data):
     crescent is assumed to be visible the day of the conjunction.
 
     """
-    return tuple([to_jdn(n) + v_off for n in new_moons(year, data=data)])
+    astro_data = __optionally_load_data(data)
+    first, last = astro_data.new_moons.year_indices(year)
+    if first == last:
+        raise HeniautosNoDataError(f"No data for the year {year}")
+
+    return tuple([n + v_off for n in astro_data.new_moon_jdns[first:last]])
 
 
 def month_name(month, name_as=MonthNameOptions.TRANSLITERATION):
@@ -729,118 +917,23 @@ def __calendar_months(
     sol1 = to_jdn(observed_solar_event(year, event, s_off, astro_data))
     sol2 = to_jdn(observed_solar_event(year + 1, event, s_off, astro_data))
 
-    moons = [
-        to_jdn(v)
-        for v in visible_new_moons(year, v_off, astro_data)
+    moons = (
+        visible_new_moons(year, v_off, astro_data)
         + visible_new_moons(year + 1, v_off, astro_data)
         + visible_new_moons(year + 2, v_off, astro_data)
-    ]
+    )
 
     first, last = __bounding_moons(moons, sol1, sol2, before_event)
 
     return tuple([m for m in zip(moons, moons[1:]) if first <= m[0] <= last])
 
 
-def __festival_months(
-    year, data, event=Seasons.SUMMER_SOLSTICE, before_event=False, v_off=1, s_off=0
-):
-    """Return a tuple of dicts, each containing a month index, start JDN for the month and (non-inclusive) end JND
-
-    Parameters:
-    year (int) -- The year for the calendar
-    data -- Astronomical data for calculations. By default this is
-    returned from load_data()
-    event (Seasons) -- The soloar event that marks the beginning of the year (default Seasons.SUMMER_SOLSTICE)
-    before_event: True if new moons should preceded the solar event, false if they should follow
-    v_off (int) -- Offset from the conjunction for lunar visibility (default: 1)
-    s_off (int) -- Offet for solar event in days (default: 0)
-    """
-    return tuple(
-        [
-            {"month_index": m[0], "start": m[1][0], "end": m[1][1]}
-            for m in enumerate(
-                __calendar_months(
-                    year,
-                    data,
-                    event=event,
-                    before_event=before_event,
-                    v_off=v_off,
-                    s_off=s_off,
-                ),
-                1,
-            )
-        ]
-    )
-
-
 calendar_months = __calendar_months
 
 
-def _doy_gen(n=1):
-    """Recursivly return natural numbers starting with n."""
-    yield n
-    yield from _doy_gen(n + 1)
-
-
 def doy_gen(n=1):
-    """Recursivly return natural numbers starting with n."""
-    yield n
-    yield from _doy_gen(n + 1)
-
-
-def __make_generic_month(month, doy):
-    """Generate a tuple of days for a given month
-
-    Params:
-    months -- a dict (from festival_months()) with start and end JDNs
-    doy -- a generator that returns the next integer (to keep track of days of the year
-
-    This generates a tuple of FestivalDay objects, one for each day of a month bounded by the start JDN (inclusive) and end JDN (exclusive) passed as the month parameter. This is a generic list, with no specific Greek month assigned yet.
-    """
-    return tuple(
-        [
-            FestivalDay(
-                month["start"] + d - 1,
-                None,
-                month["month_index"],
-                None,
-                month["end"] - month["start"],
-                d,
-                next(doy),
-                None,
-                None,
-                None,
-            )
-            for d in range(1, month["end"] - month["start"] + 1, 1)
-        ]
-    )
-
-
-def __base_festival_calendar(
-    year, data, event=Seasons.SUMMER_SOLSTICE, before_event=False, v_off=1, s_off=0
-):
-    """Generate a base calendar for a given year
-
-    Params:
-    year (int) -- The year for the calendar
-    data -- Astronomical data for calculations. By default this is
-    returned from load_data()
-    event (Seasons) -- The soloar event that marks the beginning of the year (default Seasons.SUMMER_SOLSTICE)
-    before_event: True if new moons should preceded the solar event, false if they should follow
-    v_off (int) -- Offset from the conjunction for lunar visibility (default: 1)
-    s_off (int) -- Offet for solar event in days (default: 0)
-
-    Generate a base calendar, a tuple of FestivalDay objects.
-
-    """
-
-    doy = _doy_gen()
-
-    months = __festival_months(
-        year, data, event=event, before_event=before_event, v_off=v_off, s_off=s_off
-    )
-
-    return tuple([a for b in [__make_generic_month(m, doy) for m in months] for a in b])
+    """Return natural numbers starting with n."""
+    return count(n)
 
 
 def __intercalary_order(months, intercalate=6):
@@ -889,45 +982,87 @@ def __intercalated_month_name_map(calendar, months):
     return MONTH_NAME_MAP
 
 
-def __make_festival_day(
-    cal_day,
-    cal_year,
-    name_as,
-    year,
-    year_len=None,
-    calendar=None,
-    months=None,
-    month_length=None,
-    month_names=None,
-):
-    """Add month name and constant to FestivalDay
+FestivalCacheInfo = namedtuple(
+    "FestivalCacheInfo", ("hits", "misses", "maxsize", "currsize")
+)
 
-    Params:
-    cal_day: A FestivalDay object
-    cal_year: year of calendar (as string, e.g. "BCE 411/410")
-    name_as: A MonthNameOptions constant for the month name version
-    calendar: A Cal constant for the requested calendar
-    months: The list of appropriate month constants
-    month_names: The month names lookup dictionary
+__festival_cache = None
+__festival_cache_size = 0
+__festival_cache_stats = {"hits": 0, "misses": 0}
+__festival_cache_lock = threading.Lock()
 
-    The passed in FestivalDay object does not yet contain a month from a specific calendar. If the months param is None, this is returned unchanged. Otherwise, the month constant and requested version (transliterated, abbreviated, Greek as specified by name_as) of the month name are added.
 
+def enable_festival_cache(maxsize=512):
+    """Keep the most recently calculated years of :py:func:`festival_calendar`.
+
+    :param maxsize: Maximum number of years to keep (default: 512)
+    :type maxsize: int
+
+    Calendars are cached by all of the parameters of
+    :py:func:`festival_calendar` and the contents of the astronomical
+    data, so a cached year is returned only when an identical one
+    would be calculated. When the cache is full the least recently
+    used year is discarded. Calling this again changes the size of the
+    cache and clears it.
     """
-    if months is None:
-        return cal_day
-
-    return FestivalDay(
-        cal_day.jdn,
-        month_names[(calendar, months[cal_day.month_index - 1])][name_as],
-        cal_day.month_index,
-        months[cal_day.month_index - 1],
-        month_length,
-        cal_day.day,
-        cal_day.doy,
-        cal_year,
-        year_len,
-        year,
-    )
+    global __festival_cache, __festival_cache_size
+
+    if maxsize < 1:
+        raise ValueError("maxsize must be at least 1")
+
+    with __festival_cache_lock:
+        __festival_cache = OrderedDict()
+        __festival_cache_size = maxsize
+        __festival_cache_stats.update(hits=0, misses=0)
+
+
+def disable_festival_cache():
+    """Stop caching :py:func:`festival_calendar` and discard the cache."""
+    global __festival_cache, __festival_cache_size
+
+    with __festival_cache_lock:
+        __festival_cache = None
+        __festival_cache_size = 0
+        __festival_cache_stats.update(hits=0, misses=0)
+
+
+def clear_festival_cache():
+    """Discard all cached years and reset the statistics.
+
+    The first days of years and months found for every set of
+    parameters, and the prytany boundaries found for conciliar
+    calendars, which are kept whether or not the cache is enabled, are
+    discarded as well.
+    """
+    from heniautos.prytanies import _clear_caches
+
+    with __festival_cache_lock:
+        if __festival_cache is not None:
+            __festival_cache.clear()
+
+        __festival_cache_stats.update(hits=0, misses=0)
+
+    with __starts_lock:
+        __year_starts.clear()
+        __month_starts.clear()
+
+    _clear_caches()
+
+
+def festival_cache_info():
+    """Return statistics for the :py:func:`festival_calendar` cache.
+
+    :return: Numbers of hits and misses, the maximum size (0 if
+        caching is disabled) and the current number of cached years
+    :rtype: FestivalCacheInfo
+    """
+    with __festival_cache_lock:
+        return FestivalCacheInfo(
+            __festival_cache_stats["hits"],
+            __festival_cache_stats["misses"],
+            __festival_cache_size,
+            0 if __festival_cache is None else len(__festival_cache),
+        )
 
 
 def festival_calendar(
@@ -968,39 +1103,264 @@ def festival_calendar(
     returned with the month and month_name members of each
     FestivalDay being None.
 
+    If the cache has been enabled with :py:func:`enable_festival_cache`
+    a previously calculated year may be returned.
+
     """
+    astro = __optionally_load_data(data)
+    params = (year, calendar, intercalate, name_as, event, before_event, v_off, s_off)
+
+    if __festival_cache is None:
+        return __festival_calendar(*params, astro)
+
+    key = params + (astro,)
+    with __festival_cache_lock:
+        cached = None if __festival_cache is None else __festival_cache.get(key)
+        if cached is not None:
+            __festival_cache.move_to_end(key)
+            __festival_cache_stats["hits"] += 1
+            return cached
+
+        __festival_cache_stats["misses"] += 1
+
+    cal = __festival_calendar(*params, astro)
 
-    base_cal = __base_festival_calendar(
-        year, data, event=event, before_event=before_event, v_off=v_off, s_off=s_off
+    with __festival_cache_lock:
+        if __festival_cache is not None:
+            __festival_cache[key] = cal
+            while len(__festival_cache) > __festival_cache_size:
+                __festival_cache.popitem(last=False)
+
+    return cal
+
+
+def __festival_calendar(
+    year, calendar, intercalate, name_as, event, before_event, v_off, s_off, data
+):
+    """Calculate a festival calendar. See festival_calendar."""
+    return tuple(
+        __festival_year(
+            __year_months(data, year, event, before_event, v_off, s_off),
+            year,
+            calendar,
+            intercalate,
+            name_as,
+        )
     )
 
-    cal_year = arkhon_year(year)
 
+def __festival_year(starts, year, calendar, intercalate, name_as):
+    """Return a FestivalYear for the month starts of a year (from
+    __year_months()), with the months and names of calendar"""
     if calendar is None:
-        return tuple(
-            [__make_festival_day(d, cal_year, name_as, year) for d in base_cal]
-        )
+        return FestivalYear(starts)
 
-    months = __month_order(calendar, intercalate, len(by_months(base_cal)) > 12)
-    month_names = __intercalated_month_name_map(calendar, months)
-    return tuple(
-        [
-            __make_festival_day(
-                d,
-                cal_year,
-                name_as,
-                year,
-                base_cal[-1].doy,
-                calendar,
-                months,
-                d.month_length,
-                month_names,
-            )
-            for d in base_cal
-        ]
+    month_o = __month_order(calendar, intercalate, len(starts) > 13)
+    month_names = __intercalated_month_name_map(calendar, month_o)
+    return FestivalYear(
+        starts,
+        month_o,
+        tuple([month_names[(calendar, m)][name_as] for m in month_o]),
+        arkhon_year(year),
+        year,
     )
 
 
+def __first_moon_index(astro, year, event, before_event, v_off, s_off):
+    """Return the index (in astro.new_moon_jdns) of the new moon that
+    begins the year beginning with the solar event in year. Raises
+    HeniautosNoDataError if there is no new moon before the solar
+    event and before_event is True"""
+    sol = to_jdn(observed_solar_event(year, event, s_off, astro))
+    i = bisect_right(astro.new_moon_jdns, sol - v_off)
+
+    if before_event:
+        if i == 0:
+            raise HeniautosNoDataError(f"No data for the year {year}")
+
+        return i - 1
+
+    return i
+
+
+def __check_moon_years(astro, year):
+    """Raise HeniautosNoDataError unless there are new moons for the three
+    years festival_calendar() uses for year"""
+    for y in range(year, year + 3):
+        first, end = astro.new_moons.year_indices(y)
+        if first == end:
+            raise HeniautosNoDataError(f"No data for the year {y}")
+
+
+def festival_calendars(
+    year1,
+    year2,
+    calendar=Cal.GENERIC,
+    intercalate=6,
+    name_as=MonthNameOptions.TRANSLITERATION,
+    event=Seasons.SUMMER_SOLSTICE,
+    before_event=False,
+    v_off=1,
+    s_off=0,
+    data=load_data,
+):
+    """Generate festival calendars for a range of years.
+
+    Parameters:
+    year1 (int) -- The first year
+    year2 (int) -- The last year (inclusive)
+
+    The other parameters are as for festival_calendar.
+
+    Yields a FestivalYear for each year from year1 to year2, equal to
+    the tuple festival_calendar would return for that year. The start
+    of each year is the start of the next year of the previous one, so
+    each year begins exactly where the previous one ended.
+
+    Years are calculated as they are requested. HeniautosNoDataError
+    is raised on reaching a year for which there is not enough data.
+
+    """
+    astro = __optionally_load_data(data)
+
+    for year in range(year1, year2 + 1):
+        yield __festival_year(
+            __year_months(astro, year, event, before_event, v_off, s_off),
+            year,
+            calendar,
+            intercalate,
+            name_as,
+        )
+
+
+CalendarSweep = namedtuple(
+    "CalendarSweep", ("years", "starts", "lengths", "intercalary")
+)
+
+
+def calendar_sweep(
+    year1,
+    year2,
+    v_off=(1,),
+    s_off=(0,),
+    before_event=(False,),
+    event=(Seasons.SUMMER_SOLSTICE,),
+    data=load_data,
+    workers=None,
+):
+    """Compare the years resulting from combinations of parameters.
+
+    Parameters:
+    year1 (int) -- The first year
+    year2 (int) -- The last year (inclusive)
+    v_off (iterable) -- Offsets from the conjunction for lunar
+    visibility (default: (1,))
+    s_off (iterable) -- Offsets for the solar event (default: (0,))
+    before_event (iterable) -- Values of before_event (default: (False,))
+    event (iterable) -- Solar events with which the year begins
+    (default: (Seasons.SUMMER_SOLSTICE,))
+    data -- Astronomical data for calculations. By default this is
+    returned from load_data()
+    workers (int) -- Number of processes for calculations (default:
+    None, calculate in this process)
+
+    Returns a dict with a CalendarSweep for every combination of the
+    parameters, keyed by (event, before_event, v_off, s_off). Each
+    CalendarSweep has the years from year1 to year2 and, for each
+    year, the JDN on which it starts, its length in days, and whether
+    it is intercalary. These are the same as the start, length and
+    number of months of festival_calendar for the year with the same
+    parameters.
+
+    Each solar event is found once for all of the combinations, and
+    each new moon beginning a year once for each combination of
+    before_event and the difference between v_off and s_off. Raises
+    HeniautosNoDataError if there is not enough data for any of the
+    years.
+
+    """
+    if year2 < year1:
+        raise ValueError("year2 must not be earlier than year1")
+
+    # The parameters may be one-shot iterables
+    v_off, s_off = tuple(v_off), tuple(s_off)
+    before_event, event = tuple(before_event), tuple(event)
+
+    astro = __optionally_load_data(data)
+    for year in range(year1, year2 + 1):
+        __check_moon_years(astro, year)
+
+    tasks = [
+        (year1, year2, e, b, v_off, s_off)
+        for e in dict.fromkeys(event)
+        for b in dict.fromkeys(before_event)
+    ]
+
+    if workers is None or workers < 2 or len(tasks) < 2:
+        sweeps = [__sweep(astro, *task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(tasks)),
+            initializer=__init_sweep_worker,
+            initargs=(astro,),
+        ) as pool:
+            sweeps = list(pool.map(__sweep_worker, tasks))
+
+    results = {k: v for sweep in sweeps for k, v in sweep.items()}
+    return {p: results[p] for p in product(event, before_event, v_off, s_off)}
+
+
+def __sweep(astro, year1, year2, event, before_event, v_offs, s_offs):
+    """Return a dict of CalendarSweeps for one event and before_event"""
+    moons = astro.new_moon_jdns
+    sols = [to_jdn(solar_event(y, event, astro)) for y in range(year1, year2 + 2)]
+    years = range(year1, year2 + 1)
+
+    # Years begin with the same new moons whenever s_off - v_off is the same
+    indices = {}
+    sweep = {}
+    for v_off, s_off in product(v_offs, s_offs):
+        if s_off - v_off not in indices:
+            indices[s_off - v_off] = [
+                bisect_right(moons, sol + s_off - v_off) - (1 if before_event else 0)
+                for sol in sols
+            ]
+
+            # Indices only increase, so only the first can be before
+            # the data and only the last after it
+            if indices[s_off - v_off][0] < 0:
+                raise HeniautosNoDataError(f"No data for the year {year1}")
+
+            if indices[s_off - v_off][-1] >= len(moons):
+                raise HeniautosNoDataError(f"No data for the year {year2 + 1}")
+
+        idx = indices[s_off - v_off]
+        starts = tuple([moons[i] + v_off for i in idx])
+        sweep[(event, before_event, v_off, s_off)] = CalendarSweep(
+            years,
+            starts[:-1],
+            tuple([b - a for a, b in zip(starts, starts[1:])]),
+            tuple([b - a > 12 for a, b in zip(idx, idx[1:])]),
+        )
+
+    return sweep
+
+
+# Astronomical data in a calendar_sweep worker process
+__sweep_data = None
+
+
+def __init_sweep_worker(astro):
+    """Keep the astronomical data in each worker process"""
+    global __sweep_data
+    __sweep_data = astro
+
+
+def __sweep_worker(task):
+    """Calculate a calendar_sweep task in a worker process"""
+    return __sweep(__sweep_data, *task)
+
+
 def athenian_festival_calendar(
     year,
     intercalate=AthenianMonths.POS,
@@ -1241,6 +1601,92 @@ def corinthian_festival_calendar(
     )
 
 
+# Year and month starts for each data set and set of parameters. These
+# are kept until the data is discarded or clear_festival_cache() is
+# called, so they grow with the number of different years and
+# parameters used. They are only read and changed while holding
+# __starts_lock; the values are calculated without it.
+__year_starts = weakref.WeakKeyDictionary()
+__month_starts = weakref.WeakKeyDictionary()
+__starts_lock = threading.Lock()
+
+
+def __cached_starts(cache, astro, params):
+    """Return the dict of starts by year in cache for astro and params"""
+    with __starts_lock:
+        return cache.setdefault(astro, {}).setdefault(params, {})
+
+
+def __year_start_index(astro, year, event, before_event, v_off, s_off):
+    """Return the index (in astro.new_moon_jdns) of the first new moon of
+    year. Indices are kept for each set of parameters once found."""
+    starts = __cached_starts(__year_starts, astro, (event, before_event, v_off, s_off))
+
+    with __starts_lock:
+        if year in starts:
+            return starts[year]
+
+    index = __first_moon_index(astro, year, event, before_event, v_off, s_off)
+    with __starts_lock:
+        starts[year] = index
+
+    return index
+
+
+def __year_months(astro, year, event, before_event, v_off, s_off):
+    """Return the JDNs of the first day of each month of year, followed
+    by the first day of the next year. These are the same for every
+    calendar with the same solar event, and are kept for each set of
+    parameters once found."""
+    starts = __cached_starts(__month_starts, astro, (event, before_event, v_off, s_off))
+
+    with __starts_lock:
+        if year in starts:
+            return starts[year]
+
+    first = __year_start_index(astro, year, event, before_event, v_off, s_off)
+    last = __year_start_index(astro, year + 1, event, before_event, v_off, s_off)
+    __check_moon_years(astro, year)
+
+    # The year ends early if the data has no new moon after it
+    moons = astro.new_moon_jdns
+    months = tuple([m + v_off for m in moons[first : min(last, len(moons) - 1) + 1]])
+    with __starts_lock:
+        starts[year] = months
+
+    return months
+
+
+def __jdn_year(jdn, year, astro, event, before_event, v_off, s_off):
+    """Return the year containing jdn and the indices of its first new
+    moon and the first of the next year, or None if jdn is not within
+    two years of year"""
+    moons = astro.new_moon_jdns
+
+    for _ in range(3):
+        first = __year_start_index(astro, year, event, before_event, v_off, s_off)
+        if first >= len(moons):
+            raise HeniautosNoDataError(f"No data for the year {year}")
+
+        if jdn < moons[first] + v_off:
+            year -= 1
+            continue
+
+        # Past the last new moon in the data the year cannot be found
+        last = __year_start_index(astro, year + 1, event, before_event, v_off, s_off)
+        if last >= len(moons) and jdn >= moons[-1] + v_off:
+            raise HeniautosNoDataError(f"No data for the year {year + 1}")
+
+        if last < len(moons) and jdn >= moons[last] + v_off:
+            year += 1
+            continue
+
+        __check_moon_years(astro, year)
+        return (year, first, last)
+
+    return None
+
+
 def jdn_to_festival_calendar(
     jdn,
     year=None,
@@ -1251,27 +1697,36 @@ def jdn_to_festival_calendar(
     s_off=0,
     data=load_data,
 ):
-    # If the year hint is not supplied, extract it from the jdn and recurse
+    """Find the festival calendar containing a Julian Day Number
+
+    Parameters are the same as for jdn_to_festival_day. The year is
+    found using the starts of years alone and then only that year's
+    calendar is generated. Returns an empty tuple if the jdn is not
+    within two years of the year hint.
+
+    """
+    # If the year hint is not supplied, extract it from the jdn
     if not isinstance(year, int):
-        return jdn_to_festival_calendar(
-            jdn,
-            jd.to_julian(jdn)[0],
-            calendar=calendar,
-            intercalate=intercalate,
-            name_as=name_as,
-            v_off=v_off,
-            s_off=s_off,
-            data=data,
-        )
+        year = jd.to_julian(jdn)[0]
 
-    for y in reversed(range(year - 1, year + 1)):
-        candidate_cal = CAL_FUNCTION_MAP[calendar](
-            y, intercalate, name_as, v_off, s_off, data
-        )
-        if jdn in [d.jdn for d in candidate_cal]:
-            return candidate_cal
+    astro = __optionally_load_data(data)
+    event, before_event = CAL_RULES[calendar]
+    found = __jdn_year(jdn, year, astro, event, before_event, v_off, s_off)
+
+    if found is None:
+        return ()
 
-    return ()
+    return festival_calendar(
+        found[0],
+        calendar,
+        intercalate,
+        name_as,
+        event,
+        before_event,
+        v_off,
+        s_off,
+        astro,
+    )
 
 
 def jdn_to_festival_day(
@@ -1298,27 +1753,112 @@ def jdn_to_festival_day(
     data -- Astronomical data for calculations. By default this is
     returned from load_data()
 
+    The year, month and day are found by bisecting the starts of
+    years and months, without generating the calendar. Raises
+    HeniautosDateNotFoundError if the jdn is not within two years of
+    the year hint.
+
     """
-    # If the year hint is not supplied, extract it from the jdn and recurse
+    # If the year hint is not supplied, extract it from the jdn
     if not isinstance(year, int):
-        return jdn_to_festival_day(
-            jdn,
-            jd.to_julian(jdn)[0],
-            calendar=calendar,
-            intercalate=intercalate,
-            name_as=name_as,
-            v_off=v_off,
-            s_off=s_off,
-            data=data,
-        )
+        year = jd.to_julian(jdn)[0]
 
-    return [
-        d
-        for d in jdn_to_festival_calendar(
-            jdn, year, calendar, intercalate, name_as, v_off, s_off, data
+    astro = __optionally_load_data(data)
+    event, before_event = CAL_RULES[calendar]
+    found = __jdn_year(jdn, year, astro, event, before_event, v_off, s_off)
+
+    if found is None:
+        raise HeniautosDateNotFoundError(
+            f"{jdn} is not within two years of the calendar year {year}"
         )
-        if d.jdn == jdn
-    ][0]
+
+    festival_year = __festival_year(
+        __year_months(astro, found[0], event, before_event, v_off, s_off),
+        found[0],
+        calendar,
+        intercalate,
+        name_as,
+    )
+
+    return festival_year[jdn - festival_year.starts[0]]
+
+
+def jdns_to_festival_days(
+    jdns,
+    calendar=Cal.ATHENIAN,
+    intercalate=6,
+    name_as=MonthNameOptions.TRANSLITERATION,
+    v_off=1,
+    s_off=0,
+    data=load_data,
+    columns=False,
+):
+    """Find the festival dates corresponding to many Julian Day Numbers
+
+    Parameters:
+    jdns -- A sequence (or array) of Julian Day Numbers
+    columns (bool) -- Return a dict of columns instead of a list (default: False)
+
+    The other parameters are the same as for jdn_to_festival_day. To
+    convert Julian or Gregorian dates, convert them to JDNs with
+    to_jdn(juliandate.from_julian(...)) or from_gregorian().
+
+    Returns a list with the FestivalDay for each JDN, in the same
+    order. JDNs for which there is not enough data are None. With
+    columns=True, returns a dict with a list for each member of
+    FestivalDay instead (with None for every member of a JDN without
+    data).
+
+    The JDNs are sorted and the months of each year they fall in are
+    found once, however many JDNs there are in the year.
+
+    """
+    astro = __optionally_load_data(data)
+    event, before_event = CAL_RULES[calendar]
+
+    days = {}
+    festival_year = None
+    for jdn in sorted(set([int(j) for j in jdns])):
+        if festival_year is None or not (
+            festival_year.starts[0] <= jdn < festival_year.starts[-1]
+        ):
+            try:
+                found = __jdn_year(
+                    jdn,
+                    jd.to_julian(jdn)[0],
+                    astro,
+                    event,
+                    before_event,
+                    v_off,
+                    s_off,
+                )
+            except HeniautosNoDataError:
+                found = None
+
+            if found is None:
+                festival_year = None
+                days[jdn] = None
+                continue
+
+            festival_year = __festival_year(
+                __year_months(astro, found[0], event, before_event, v_off, s_off),
+                found[0],
+                calendar,
+                intercalate,
+                name_as,
+            )
+
+        days[jdn] = festival_year[jdn - festival_year.starts[0]]
+
+    result = [days[int(j)] for j in jdns]
+
+    if columns:
+        return {
+            f: [None if d is None else getattr(d, f) for d in result]
+            for f in FestivalDay._fields
+        }
+
+    return result
 
 
 def julian_to_festival_day(
@@ -1442,46 +1982,31 @@ def festival_to_jdn(
     s_off (int) -- Offet for solar event in days (default: 0)
     data -- Astronomical data for calculations. By default this is
     returned from load_data()
-    """
-    try:
 
-        return [
-            d.jdn
-            for d in festival_calendar(
-                year,
-                calendar=calendar,
-                intercalate=intercalate,
-                event=event,
-                before_event=before_event,
-                v_off=v_off,
-                s_off=s_off,
-                data=data,
-            )
-            if d.month == month and d.day == day
-        ][0]
-    except IndexError:
-        raise HeniautosNoDayInYearError(
-            f"There is no day matching month {month}, day {day} in the year {year}"
-        )
+    The JDN is calculated from the start of the month, without
+    generating the calendar. Raises HeniautosNoDayInYearError if the
+    month is not in the year (e.g. Months.INT in a year without
+    intercalation) or the day is not in the month.
 
+    """
+    starts = __year_months(
+        __optionally_load_data(data), year, event, before_event, v_off, s_off
+    )
+    count = len(starts) - 1
+    months = (
+        ()
+        if calendar is None
+        else __month_order(calendar, intercalate, count > 12)[:count]
+    )
 
-def __calendar_months_r(
-    start,
-    end,
-    data,
-    event=Seasons.SUMMER_SOLSTICE,
-    before_event=False,
-    v_off=1,
-    s_off=0,
-):
-    """Recursively return a sequence of calendar months, possibly
-    over multiple years."""
-    if start > end:
-        return ()
+    if month in months:
+        m = months.index(month)
+        if 1 <= day <= starts[m + 1] - starts[m]:
+            return starts[m] + day - 1
 
-    return __calendar_months(
-        start, data, event, before_event, v_off, s_off
-    ) + __calendar_months_r(start + 1, end, data, event, before_event, v_off, s_off)
+    raise HeniautosNoDayInYearError(
+        f"There is no day matching month {month}, day {day} in the year {year}"
+    )
 
 
 def octaeteris_gen(start):
@@ -1494,69 +2019,6 @@ def octaeteris_gen(start):
         i = i % 8 + 1
 
 
-def __octaeteris_years(
-    months,
-    year1,
-    year2,
-    oct_gen,
-    calendar=Cal.GENERIC,
-    intercalate=6,
-    name_as=MonthNameOptions.TRANSLITERATION,
-    event=Seasons.SUMMER_SOLSTICE,
-    before_event=False,
-    v_off=1,
-    s_off=0,
-    data=load_data,
-):
-    """Recursively return a sequence of festival calendars based on
-    octaeteric intercalation."""
-    if year1 > year2:
-        return ()
-
-    m_count = next(oct_gen)
-
-    festival_months = tuple(
-        [
-            {"month_index": m[0], "start": m[1][0], "end": m[1][1]}
-            for m in enumerate(
-                months[0:m_count],
-                1,
-            )
-        ]
-    )
-
-    doy = _doy_gen()
-
-    base_cal = tuple(
-        [a for b in [__make_generic_month(m, doy) for m in festival_months] for a in b]
-    )
-
-    month_o = __month_order(calendar, intercalate, len(by_months(base_cal)) > 12)
-
-    cal_year = arkhon_year(year1)
-    month_names = __intercalated_month_name_map(calendar, month_o)
-    oct_year = tuple(
-        [
-            __make_festival_day(
-                d,
-                cal_year,
-                name_as,
-                year1,
-                base_cal[-1].doy,
-                calendar,
-                month_o,
-                d.month_length,
-                month_names,
-            )
-            for d in base_cal
-        ]
-    )
-
-    return (oct_year,) + __octaeteris_years(
-        months[m_count:], year1 + 1, year2, oct_gen, calendar, intercalate, name_as
-    )
-
-
 def octaeteris(
     oct_index,
     year1,
@@ -1625,26 +2087,97 @@ def octaeteris(
 
     """
 
-    end_year = year1 if year2 is None else year2
-    lunar_months = __calendar_months_r(
-        year1, end_year + 1, data, event, before_event, v_off, s_off
+    return tuple(
+        [
+            tuple(y)
+            for y in octaeteris_calendars(
+                oct_index,
+                year1,
+                year2,
+                calendar,
+                intercalate,
+                name_as,
+                event,
+                before_event,
+                v_off,
+                s_off,
+                data,
+            )
+        ]
     )
 
-    return __octaeteris_years(
-        lunar_months,
-        year1,
-        end_year,
-        octaeteris_gen(oct_index),
-        calendar,
-        intercalate,
-        name_as,
-    )
+
+def octaeteris_calendars(
+    oct_index,
+    year1,
+    year2=None,
+    calendar=Cal.GENERIC,
+    intercalate=6,
+    name_as=MonthNameOptions.TRANSLITERATION,
+    event=Seasons.SUMMER_SOLSTICE,
+    before_event=False,
+    v_off=1,
+    s_off=0,
+    data=load_data,
+):
+    """Generate octaeteric festival calendars for a range of years.
+
+    The parameters are the same as for octaeteris.
+
+    Yields a FestivalYear for each year from year1 to year2, equal to
+    the corresponding member of the tuple octaeteris would return. The
+    new moons are read as each year is requested, so the first year is
+    available as soon as it is calculated however long the range
+    is. HeniautosNoDataError is raised on reaching a year for which
+    there is not enough data.
+
+    """
+    astro = __optionally_load_data(data)
+    moons = astro.new_moon_jdns
+    oct_gen = octaeteris_gen(oct_index)
+
+    for year in range(year1, (year1 if year2 is None else year2) + 1):
+        if year == year1:
+            first = __first_moon_index(astro, year, event, before_event, v_off, s_off)
+            __check_moon_years(astro, year)
+
+        last = first + next(oct_gen)
+
+        # Consecutive new moons are never more than 30 days apart, so a
+        # bigger difference is a gap in the data
+        if last >= len(moons) or any(
+            [moons[i + 1] - moons[i] > 30 for i in range(first, last)]
+        ):
+            raise HeniautosNoDataError(f"No data for the year {year}")
+
+        yield __festival_year(
+            tuple([moons[i] + v_off for i in range(first, last + 1)]),
+            year,
+            calendar,
+            intercalate,
+            name_as,
+        )
+
+        first = last
 
 
 def version():
     return __version__
 
 
+# The solar event that begins the year on each calendar, and whether
+# the year begins with the new moon before it (True) or after it (False)
+CAL_RULES = {
+    Cal.ARGIVE: (Seasons.AUTUMN_EQUINOX, True),
+    Cal.ATHENIAN: (Seasons.SUMMER_SOLSTICE, False),
+    Cal.CORINTHIAN: (Seasons.AUTUMN_EQUINOX, True),
+    Cal.DELPHIAN: (Seasons.SUMMER_SOLSTICE, False),
+    Cal.DELIAN: (Seasons.WINTER_SOLSTICE, False),
+    Cal.GENERIC: (Seasons.SUMMER_SOLSTICE, False),
+    Cal.MACEDONIAN: (Seasons.AUTUMN_EQUINOX, False),
+    Cal.SPARTAN: (Seasons.AUTUMN_EQUINOX, True),
+}
+
 CAL_FUNCTION_MAP = {
     Cal.ARGIVE: argive_festival_calendar,
     Cal.ATHENIAN: athenian_festival_calendar,
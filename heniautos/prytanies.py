@@ -17,7 +17,11 @@ from collections import namedtuple
 from enum import IntEnum
 import juliandate as jd
 # import heniautos
-from itertools import product
+from array import array
+from bisect import bisect_right
+from itertools import accumulate, product
+import threading
+import weakref
 
 
 class Prytanies(IntEnum):
@@ -50,11 +54,14 @@ def load_data():
     return load_data()
 
 def __optionally_load_data(data):
-    """Return result of function call if param is a function, or the param."""
+    """Return result of function call if param is a function, or the
+    param, as AstroData."""
+    from heniautos.astrodata import AstroData
+
     if callable(data):
-        return data()
+        return AstroData.coerce(data())
 
-    return data
+    return AstroData.coerce(data)
 
 
 # Maybe remove
@@ -81,60 +88,6 @@ def prytany_label(p):
     )[int(p) - 1]
 
 
-def _pryt_len(days, count=4):
-    """Recursively generate prytany lengths.
-
-    Generator for conciliar years that have count number of prytanies
-    of days length, with the remaining being days - 1. E.g. Four
-    36-day pryanties followed by 35-day prytanies.
-    """
-    if count:
-        yield days
-        yield from _pryt_len(days, count - 1)
-
-    if count == 0:
-        yield from _pryt_len(days - 1, count - 1)
-
-    yield from _pryt_len(days, count)
-
-
-def __pryt_len_festival(cal):
-    """Recursivly generate prytanies that match the festival calendar."""
-    if len(cal) == 0:
-        return
-
-    yield cal[0][1] - cal[0][0]
-    yield from __pryt_len_festival(cal[1:])
-
-
-def _pryt_gen(start, end, length, num=10, count=1):
-    """Recursively generate dicts representing prytanies."""
-    import heniautos
-    
-    if count == num:
-        # If this is the 10th prytany, return the EOY date as the end
-        # date of the prytany, which may be one day more or one day
-        # less than the expected length. Then stop
-        yield {
-            "prytany": count,
-            "constant": list(Prytanies)[count - 1],
-            "start": int(start),
-            "end": int(end),
-        }
-        return
-
-    # p_end = tt_round(start, next(length))
-    p_end = heniautos.to_jdn(start) + next(length)
-
-    yield {
-        "prytany": count,
-        "constant": list(Prytanies)[count - 1],
-        "start": int(start),
-        "end": int(p_end),
-    }
-    yield from _pryt_gen(p_end, end, length, num, count + 1)
-
-
 def prytany_type(year):
     """Determine prytany type base on year."""
     from heniautos import HeniautosError
@@ -160,35 +113,110 @@ def prytany_type(year):
     return Prytany.ALIGNED_10
 
 
+# Lengths of the quasi-solar prytanies
+QUASI_SOLAR_LENGTHS = (37,) * 6 + (36,) * 4
+
+# Lengths of the prytanies of years aligned with the festival calendar,
+# by type, whether the festival year is intercalary, and whether the
+# rule of Aristotle is forced. The last prytany always ends with the
+# festival year, so its length here is nominal. None means that the
+# prytanies follow the festival months.
+PRYTANY_LENGTHS = {
+    (Prytany.ALIGNED_10, False, False): (36,) * 4 + (35,) * 6,
+    (Prytany.ALIGNED_10, False, True): (36,) * 4 + (35,) * 6,
+    (Prytany.ALIGNED_10, True, False): (39,) * 4 + (38,) * 6,
+    (Prytany.ALIGNED_10, True, True): (39,) * 4 + (38,) * 6,
+    (Prytany.ALIGNED_12, False, False): None,
+    (Prytany.ALIGNED_12, False, True): (30,) * 6 + (29,) * 6,
+    (Prytany.ALIGNED_12, True, False): (32,) * 12,
+    (Prytany.ALIGNED_12, True, True): (32,) * 12,
+    (Prytany.ALIGNED_13, False, False): (28,) * 3 + (27,) * 10,
+    (Prytany.ALIGNED_13, False, True): (28,) * 3 + (27,) * 10,
+    (Prytany.ALIGNED_13, True, False): None,
+    (Prytany.ALIGNED_13, True, True): (30,) * 7 + (29,) * 6,
+}
+
+
+# JDN and year of Hekatombaiṓn 1, 407 BCE, for each set of data and
+# offsets, and the prytany boundaries of each year for each set of data
+# and parameters. These are kept until the data is discarded or
+# heniautos.clear_festival_cache() is called, and are only read and
+# changed while holding __prytany_lock; the values are calculated
+# without it.
+__quasi_solar_anchors = weakref.WeakKeyDictionary()
+__year_bounds = weakref.WeakKeyDictionary()
+__prytany_lock = threading.Lock()
+
+
+def _clear_caches():
+    """Discard the quasi-solar anchors and prytany boundaries found so
+    far. Called by heniautos.clear_festival_cache()."""
+    with __prytany_lock:
+        __quasi_solar_anchors.clear()
+        __year_bounds.clear()
+
+
+def __quasi_solar_anchor(v_off, s_off, data):
+    """Return the JDN of the first day of 407 BCE (also Prytany I.1 that
+    year) and its Julian year. These are kept for each set of data and
+    offsets once found."""
+    from heniautos import festival_to_jdn
+
+    astro = __optionally_load_data(data)
+    with __prytany_lock:
+        anchors = __quasi_solar_anchors.setdefault(astro, {})
+        if (v_off, s_off) in anchors:
+            return anchors[(v_off, s_off)]
+
+    start_jdn = festival_to_jdn(-406, 1, 1, v_off=v_off, s_off=s_off, data=astro)
+    with __prytany_lock:
+        anchors[(v_off, s_off)] = (start_jdn, jd.to_julian(start_jdn)[0])
+        return anchors[(v_off, s_off)]
+
+
 def _pryt_auto_start(
     year,
     pryt_start=Prytany.AUTO,
     v_off=1,
     s_off=0,
-    data=(),
+    data=load_data,
 ):
     """Determine start dates for quasi-solar prytanies. Based on Meritt
     (1961)
 
     """
-
-    from heniautos import festival_to_jdn
-
     if pryt_start != Prytany.AUTO:
         offset = year - jd.to_julian(pryt_start)[0]
         return pryt_start + (offset * 366)
 
-    start_jdn = festival_to_jdn(-406, 1, 1, v_off=v_off, s_off=s_off, data=data)
-    offset = year - jd.to_julian(start_jdn)[0]
+    start_jdn, start_year = __quasi_solar_anchor(v_off, s_off, data)
 
-    return start_jdn + (offset * 366)
+    return start_jdn + ((year - start_year) * 366)
 
 
 def _pryt_solar_end(start):
     return heniautos.to_jdn(__add_years(start, 1))
 
 
-def __prytanies(
+def __aligned_bounds(pryt_type, months, rule_of_aristotle):
+    """Return the prytany boundaries of a year aligned with the festival
+    year that has the month starts in months (e.g. FestivalYear.starts)"""
+    from heniautos import HeniautosError
+
+    try:
+        lengths = PRYTANY_LENGTHS[
+            (pryt_type, months[-1] - months[0] > 355, bool(rule_of_aristotle))
+        ]
+    except KeyError:
+        raise HeniautosError(f"Prytany type {pryt_type} is not handled")
+
+    if lengths is None:
+        return array("q", months)
+
+    return array("q", [*accumulate(lengths[:-1], initial=months[0]), months[-1]])
+
+
+def _pryt_bounds(
     year,
     pryt_type=Prytany.AUTO,
     pryt_start=Prytany.AUTO,
@@ -197,105 +225,153 @@ def __prytanies(
     rule_of_aristotle=False,
     data=load_data,
 ):
-    """Return tuple of prytanies. See prytany_calendar for parameters."""
+    """Return the JDNs of the first day of each prytany of a year,
+    followed by the first day of the next year, as an array. See
+    prytany_calendar for parameters."""
+    from heniautos import festival_calendars
 
-    from heniautos import calendar_months
-    
     auto_type = prytany_type(year) if pryt_type == Prytany.AUTO else pryt_type
 
     if auto_type == Prytany.QUASI_SOLAR:
-        start = _pryt_auto_start(year, pryt_start, v_off=v_off, s_off=s_off, data=data)
-        end = start + 366  # _pryt_solar_end(start)
-        p_len = _pryt_len(37, 6)
-        pryt = _pryt_gen(start, end, p_len)
-        return tuple([p for p in pryt])
-
-    # Get the calendar for the requested year
-    cal = calendar_months(year, v_off=v_off, s_off=s_off, data=data)
-    y_len = sum([m[1] - m[0] for m in cal])
-
-    if auto_type == Prytany.ALIGNED_10:
-        # Generate prytanies
-        return tuple(
-            [
-                p
-                for p in _pryt_gen(
-                    cal[0][0], cal[-1][1], _pryt_len(39 if y_len > 355 else 36)
-                )
-            ]
+        return array(
+            "q",
+            accumulate(
+                QUASI_SOLAR_LENGTHS,
+                initial=_pryt_auto_start(
+                    year, pryt_start, v_off=v_off, s_off=s_off, data=data
+                ),
+            ),
         )
 
-    if auto_type == Prytany.ALIGNED_12:
-        # Generate prytanies
-        # Normal: 30 * 6 + 29 * 6 (if rule of Aristotle is forced)
-        # Intercalated: 32 * 12
-        if y_len > 355 or rule_of_aristotle:
-            return tuple(
-                [
-                    p
-                    for p in _pryt_gen(
-                        cal[0][0],
-                        cal[-1][1],
-                        _pryt_len(*((33, 0) if y_len > 355 else (30, 6))),
-                        12,
-                    )
-                ]
-            )
+    festival_year = next(
+        festival_calendars(year, year, None, v_off=v_off, s_off=s_off, data=data)
+    )
 
-        # Normal year prytanies follow festival months unless rule of
-        # Aristotle is forced
-        return tuple(
-            [p for p in _pryt_gen(cal[0][0], cal[-1][1], __pryt_len_festival(cal), 12)]
-        )
+    return __aligned_bounds(auto_type, festival_year.starts, rule_of_aristotle)
 
-    if auto_type == Prytany.ALIGNED_13:
-        # Generate prytanies
-        # Intercalated prytanies follow festival months unless rule of
-        # Aristotle is forced
-        if y_len > 355 and not rule_of_aristotle:
-            return tuple(
-                [
-                    p
-                    for p in _pryt_gen(
-                        cal[0][0], cal[-1][1], __pryt_len_festival(cal), 13
-                    )
-                ]
-            )
 
-        # Normal: 28 * 3 + 27 * 10
-        # Intercalated: 32 * 12
-        return tuple(
-            [
-                p
-                for p in _pryt_gen(
-                    cal[0][0],
-                    cal[-1][1],
-                    _pryt_len(*((30, 7) if y_len > 355 else (28, 3))),
-                    13,
-                )
-            ]
+def __cached_bounds(
+    year, pryt_type, pryt_start, v_off, s_off, rule_of_aristotle, astro
+):
+    """Return _pryt_bounds for year. These are kept for each set of
+    data and parameters once found, except for explicit values of
+    pryt_start (which could be any JDN)."""
+    if pryt_start != Prytany.AUTO:
+        return _pryt_bounds(
+            year, pryt_type, pryt_start, v_off, s_off, rule_of_aristotle, astro
+        )
+
+    with __prytany_lock:
+        bounds = __year_bounds.setdefault(astro, {}).setdefault(
+            (pryt_type, v_off, s_off, bool(rule_of_aristotle)), {}
         )
+        if year in bounds:
+            return bounds[year]
+
+    year_bounds = _pryt_bounds(
+        year, pryt_type, pryt_start, v_off, s_off, rule_of_aristotle, astro
+    )
+    with __prytany_lock:
+        bounds[year] = year_bounds
+
+    return year_bounds
 
-    raise HeniautosError("Not Handled")
-
-
-def __make_prytany(prytany, pryt_year, prytany_index, doy, year_length, year):
-    from heniautos import PrytanyDay
-    return [
-        PrytanyDay(
-            prytany["start"] + d - 1,
-            prytany_index,
-            prytany["constant"],
-            prytany["end"] - prytany["start"],
-            d,
-            next(doy),
-            pryt_year,
-            year_length,
-            year
+
+def __find_prytany_year(
+    jdn, year, pryt_type, pryt_start, v_off, s_off, rule_of_aristotle, astro
+):
+    """Return the year from year - 1 to year + 1 containing jdn, and its
+    prytany boundaries, or None"""
+    years = [
+        (
+            y,
+            __cached_bounds(
+                y, pryt_type, pryt_start, v_off, s_off, rule_of_aristotle, astro
+            ),
         )
-        for d in range(1, prytany["end"] - prytany["start"] + 1, 1)
+        for y in range(year - 1, year + 2)
     ]
 
+    for y, bounds in years:
+        if bounds[0] <= jdn < bounds[-1]:
+            return (y, bounds)
+
+    return None
+
+
+def __prytany_day(jdn, year, bounds):
+    """Return the PrytanyDay for jdn in the year with prytany boundaries
+    bounds"""
+    from heniautos import PrytanyDay, arkhon_year
+
+    i = bisect_right(bounds, jdn)
+    return PrytanyDay(
+        jdn,
+        i,
+        Prytanies(i),
+        bounds[i] - bounds[i - 1],
+        jdn - bounds[i - 1] + 1,
+        jdn - bounds[0] + 1,
+        arkhon_year(year),
+        bounds[-1] - bounds[0],
+        year,
+    )
+
+
+def __prytany_columns(bounds, year):
+    """Return a dict with a list for each member of PrytanyDay, for the
+    prytanies beginning on the JDNs in bounds"""
+    from heniautos import PrytanyDay, arkhon_year
+
+    lengths = [end - start for start, end in zip(bounds, bounds[1:])]
+    year_len = bounds[-1] - bounds[0]
+
+    return dict(
+        zip(
+            PrytanyDay._fields,
+            (
+                list(range(bounds[0], bounds[-1])),
+                [i for i, n in enumerate(lengths, 1) for _ in range(n)],
+                [p for p, n in zip(Prytanies, lengths) for _ in range(n)],
+                [n for n in lengths for _ in range(n)],
+                [d for n in lengths for d in range(1, n + 1)],
+                list(range(1, year_len + 1)),
+                [arkhon_year(year)] * year_len,
+                [year_len] * year_len,
+                [year] * year_len,
+            ),
+        )
+    )
+
+
+def __prytany_days(bounds, year):
+    """Return a tuple of PrytanyDays for the prytanies beginning on the
+    JDNs in bounds"""
+    from heniautos import PrytanyDay, arkhon_year
+
+    cal_year = arkhon_year(year)
+    year_len = bounds[-1] - bounds[0]
+
+    return tuple(
+        [
+            PrytanyDay(
+                jdn,
+                i,
+                constant,
+                end - start,
+                jdn - start + 1,
+                jdn - bounds[0] + 1,
+                cal_year,
+                year_len,
+                year,
+            )
+            for (i, constant), start, end in zip(
+                enumerate(Prytanies, 1), bounds, bounds[1:]
+            )
+            for jdn in range(start, end)
+        ]
+    )
+
 
 def prytany_calendar(
     year,
@@ -332,35 +408,63 @@ def prytany_calendar(
     "doy": the day of the year the day represents.
     """
 
-    from heniautos import doy_gen, arkhon_year, festival_to_jdn
-    doy = doy_gen()
-    cal_year = arkhon_year(year)
+    return __prytany_days(
+        __cached_bounds(
+            year,
+            pryt_type,
+            pryt_start,
+            v_off,
+            s_off,
+            rule_of_aristotle,
+            __optionally_load_data(data),
+        ),
+        year,
+    )
 
 
-    astro_data = __optionally_load_data(data)
-    
+def prytany_calendars(
+    year1,
+    year2,
+    pryt_type=Prytany.AUTO,
+    pryt_start=Prytany.AUTO,
+    v_off=1,
+    s_off=0,
+    rule_of_aristotle=False,
+    data=load_data,
+    columns=False,
+):
+    """Generate conciliar calendars for a range of years.
 
-    pryt_year = __prytanies(
-        year,
-        pryt_type=pryt_type,
-        pryt_start=pryt_start,
-        v_off=v_off,
-        s_off=s_off,
-        rule_of_aristotle=rule_of_aristotle,
-        data=astro_data,
-    )
-    year_len = pryt_year[-1]["end"] - pryt_year[0]["start"]
+    Parameters:
+    year1 (int) -- The first year
+    year2 (int) -- The last year (inclusive)
+    columns (bool) -- Yield a dict of columns for each year instead of
+    a tuple (default: False)
 
-    return tuple(
-        [
-            a
-            for b in [
-                __make_prytany(p, cal_year, i, doy, year_len, year)
-                for i, p in enumerate(pryt_year, 1)
-            ]
-            for a in b
-        ]
-    )
+    The other parameters are as for prytany_calendar.
+
+    Yields the tuple prytany_calendar would return for each year from
+    year1 to year2. With columns=True, yields a dict with a list for
+    each member of PrytanyDay instead, without making PrytanyDay
+    objects.
+
+    Years are calculated as they are requested, from the starts of the
+    festival months (or the quasi-solar start) of each year. Unless
+    pryt_start is given, the prytany boundaries are kept for later
+    calls with the same parameters (see clear_festival_cache).
+
+    """
+    astro = __optionally_load_data(data)
+
+    for year in range(year1, year2 + 1):
+        bounds = __cached_bounds(
+            year, pryt_type, pryt_start, v_off, s_off, rule_of_aristotle, astro
+        )
+
+        if columns:
+            yield __prytany_columns(bounds, year)
+        else:
+            yield __prytany_days(bounds, year)
 
 
 def by_prytanies(p):
@@ -406,39 +510,112 @@ def jdn_to_prytany_day(
     data=load_data,
 ):
 
-    # If the year hint is not supplied, extract it from the jdn and recurse
+    """Find the prytany date corresponding to a Julian Day Number
+
+    Parameters:
+    jdn (int) -- The Julian Day Number
+    year (int) -- The year in which to look for the date (default:
+    None, the Julian year of jdn)
+
+    The other parameters are as for prytany_calendar.
+
+    The prytany boundaries of the year before the year hint, the year
+    and the year after are found (and, unless pryt_start is given,
+    kept for later calls with the same parameters), and the prytany
+    and day are found by bisecting them. Raises
+    HeniautosDateNotFoundError if jdn is not in any of those years.
+
+    """
+    from heniautos import HeniautosDateNotFoundError
+
+    # If the year hint is not supplied, extract it from the jdn
     if not isinstance(year, int):
-        return jdn_to_prytany_day(
-            jdn,
-            jd.to_julian(jdn)[0],
-            pryt_type=pryt_type,
-            pryt_start=pryt_start,
-            v_off=v_off,
-            s_off=s_off,
-            rule_of_aristotle=rule_of_aristotle,
-            data=data,
+        year = jd.to_julian(jdn)[0]
+
+    found = __find_prytany_year(
+        jdn,
+        year,
+        pryt_type,
+        pryt_start,
+        v_off,
+        s_off,
+        rule_of_aristotle,
+        __optionally_load_data(data),
+    )
+
+    if found is None:
+        raise HeniautosDateNotFoundError(
+            f"{jdn} is not within a year of the conciliar year {year}"
         )
 
-    return [
-        d
-        for d in [
-            a
-            for b in [
-                prytany_calendar(
-                    y,
-                    pryt_type=pryt_type,
-                    pryt_start=pryt_start,
-                    v_off=v_off,
-                    s_off=s_off,
-                    rule_of_aristotle=rule_of_aristotle,
-                    data=data,
+    return __prytany_day(jdn, *found)
+
+
+def jdns_to_prytany_days(
+    jdns,
+    pryt_type=Prytany.AUTO,
+    pryt_start=Prytany.AUTO,
+    v_off=1,
+    s_off=0,
+    rule_of_aristotle=False,
+    data=load_data,
+    columns=False,
+):
+    """Find the prytany dates corresponding to many Julian Day Numbers
+
+    Parameters:
+    jdns -- A sequence (or array) of Julian Day Numbers
+    columns (bool) -- Return a dict of columns instead of a list (default: False)
+
+    The other parameters are as for prytany_calendar.
+
+    Returns a list with the PrytanyDay for each JDN, in the same
+    order. JDNs that cannot be found (e.g. before 508 BCE or without
+    enough data) are None. With columns=True, returns a dict with a
+    list for each member of PrytanyDay instead (with None for every
+    member of a JDN that was not found).
+
+    The JDNs are sorted and the prytanies of each year they fall in
+    are found once, however many JDNs there are in the year.
+
+    """
+    from heniautos import HeniautosError, PrytanyDay
+
+    astro = __optionally_load_data(data)
+
+    days = {}
+    found = None
+    for jdn in sorted(set([int(j) for j in jdns])):
+        if found is None or not (found[1][0] <= jdn < found[1][-1]):
+            try:
+                found = __find_prytany_year(
+                    jdn,
+                    jd.to_julian(jdn)[0],
+                    pryt_type,
+                    pryt_start,
+                    v_off,
+                    s_off,
+                    rule_of_aristotle,
+                    astro,
                 )
-                for y in range(year - 1, year + 2)
-            ]
-            for a in b
-        ]
-        if d.jdn == jdn
-    ][0]
+            except HeniautosError:
+                found = None
+
+            if found is None:
+                days[jdn] = None
+                continue
+
+        days[jdn] = __prytany_day(jdn, *found)
+
+    result = [days[int(j)] for j in jdns]
+
+    if columns:
+        return {
+            f: [None if d is None else getattr(d, f) for d in result]
+            for f in PrytanyDay._fields
+        }
+
+    return result
 
 
 def julian_to_prytany_day(
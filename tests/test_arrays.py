@@ -0,0 +1,105 @@
+import pytest
+import heniautos as ha
+
+np = pytest.importorskip("numpy")
+from heniautos.arrays import DTYPE, festival_array, jdns_to_festival_array
+
+
+def test_festival_array():
+    arr = festival_array(-99, calendar=ha.Cal.ATHENIAN)
+    cal = ha.festival_calendar(-99, ha.Cal.ATHENIAN)
+
+    assert arr.dtype == DTYPE
+    assert len(arr) == len(cal)
+    assert [tuple(r) for r in arr] == [
+        (
+            d.jdn,
+            d.month_index,
+            d.month,
+            d.month_length,
+            d.day,
+            d.doy,
+            d.year_length,
+            d.astronomical_year,
+        )
+        for d in cal
+    ]
+
+
+def test_festival_array_range():
+    arr = festival_array(-110, -99, ha.Cal.SPARTAN, event=ha.Seasons.AUTUMN_EQUINOX)
+    cals = [
+        ha.festival_calendar(y, ha.Cal.SPARTAN, event=ha.Seasons.AUTUMN_EQUINOX)
+        for y in range(-110, -98)
+    ]
+
+    assert len(arr) == sum([len(c) for c in cals])
+    assert list(arr["jdn"]) == [d.jdn for c in cals for d in c]
+    assert list(arr["doy"]) == [d.doy for c in cals for d in c]
+    assert list(arr["month"]) == [d.month for c in cals for d in c]
+    assert list(np.unique(arr["astronomical_year"])) == list(range(-110, -98))
+
+
+def test_festival_array_generic():
+    arr = festival_array(-99, calendar=None)
+    assert not arr["month"].any()
+    assert list(arr["month_index"]) == [d.month_index for d in ha.festival_calendar(-99, None)]
+
+
+def test_festival_array_columns():
+    cols = festival_array(-110, -99, columns=True)
+    arr = festival_array(-110, -99)
+
+    assert list(cols) == list(DTYPE.names)
+    for name in DTYPE.names:
+        assert cols[name].dtype == DTYPE[name]
+        assert (cols[name] == arr[name]).all()
+
+
+def test_festival_array_errors():
+    with pytest.raises(ValueError):
+        festival_array(-99, -100)
+
+    with pytest.raises(ha.HeniautosNoDataError):
+        festival_array(2148, 2152)
+
+
+def test_jdns_to_festival_array():
+    jdns = [1572957, 1500000, 1572958, 1573400, 1]
+    arr = jdns_to_festival_array(jdns, ha.Cal.DELIAN)
+
+    assert arr.dtype == DTYPE
+    assert list(arr["jdn"]) == jdns
+    for row, day in zip(arr, ha.jdns_to_festival_days(jdns, ha.Cal.DELIAN)):
+        if day is None:
+            assert tuple(row)[1:] == (0,) * 7
+        else:
+            assert tuple(row) == (
+                day.jdn,
+                day.month_index,
+                day.month,
+                day.month_length,
+                day.day,
+                day.doy,
+                day.year_length,
+                day.astronomical_year,
+            )
+
+
+def test_jdns_to_festival_array_truncated_data():
+    from tests.test_loading_data import truncated_data
+
+    # The last is after the last new moon in the data
+    jdns = [1534785, 1531498, 1538795]
+    arr = jdns_to_festival_array(jdns, ha.Cal.DELIAN, data=truncated_data(-520, -500))
+
+    assert list(arr[:2]) == list(jdns_to_festival_array(jdns[:2], ha.Cal.DELIAN))
+    assert tuple(arr[2]) == (1538795,) + (0,) * 7
+
+
+def test_jdns_to_festival_array_columns():
+    cols = jdns_to_festival_array(np.array([1572957, 1]), columns=True)
+    assert list(cols["month_index"]) == [1, 0]
+    assert list(cols["astronomical_year"]) == [-406, 0]
+
+    assert len(jdns_to_festival_array([])) == 0
@@ -0,0 +1,191 @@
+from heniautos import *
+from heniautos.astrodata import *
+from pathlib import Path
+import pytest
+
+DATA = Path(__file__).parent.parent / "heniautos"
+
+CUSTOM = {
+    "solstices": (
+        (1685074.3287422964, 1),
+        (1685439.5648092534, 1),
+    ),
+    "new_moons": (
+        (1684907.0310656228, 0),
+        (1684936.490878384, 0),
+    ),
+}
+
+
+def test_event_table():
+    t = EventTable.from_rows(((1.5, 0), (2.5, 1), (3.5, 2)))
+    assert len(t) == 3
+    assert t[1] == (2.5, 1)
+    assert t[-1] == (3.5, 2)
+    assert list(t) == [(1.5, 0), (2.5, 1), (3.5, 2)]
+    assert t[1:] == ((2.5, 1), (3.5, 2))
+    assert type(t[1:]) is EventTable
+
+    with pytest.raises(ValueError):
+        EventTable((1.0, 2.0), (1,))
+
+
+def test_binary_matches_tsv():
+    for fn in ("solstices", "new_moons"):
+        tsv = load_tsv(DATA / f"{fn}.tsv")
+        binary = load_binary(DATA / f"{fn}.bin")
+        assert list(tsv.jd) == list(binary.jd)
+        assert list(tsv.event) == list(binary.event)
+
+
+def test_write_binary(tmp_path):
+    rows = ((1684907.0310656228, 0), (1684936.490878384, 0), (1685074.3287422964, 1))
+    write_binary(rows, tmp_path / "test.bin")
+    assert load_binary(tmp_path / "test.bin") == rows
+
+    write_binary((), tmp_path / "empty.bin")
+    assert len(load_binary(tmp_path / "empty.bin")) == 0
+
+
+def test_load_binary_errors(tmp_path):
+    (tmp_path / "bad.bin").write_bytes(b"not heniautos data")
+    with pytest.raises(ValueError):
+        load_binary(tmp_path / "bad.bin")
+
+    write_binary(((1.5, 0), (2.5, 1)), tmp_path / "short.bin")
+    (tmp_path / "short.bin").write_bytes((tmp_path / "short.bin").read_bytes()[:-1])
+    with pytest.raises(ValueError):
+        load_binary(tmp_path / "short.bin")
+
+
+def test_load_events_fallback(tmp_path):
+    tsv = tmp_path / "moons.tsv"
+    tsv.write_text("1684900.12345\t0\n1684929.5\t0\n")
+    assert load_events(tsv) == ((1684900.12345, 0), (1684929.5, 0))
+
+    # The binary file is preferred once it exists
+    write_binary(((1.5, 0),), tmp_path / "moons.bin")
+    assert load_events(tsv) == ((1.5, 0),)
+    assert tsv_to_binary(tsv) == tmp_path / "moons.bin"
+    assert load_events(tsv) == ((1684900.12345, 0), (1684929.5, 0))
+
+
+def test_load_events_stale_binary(tmp_path):
+    tsv = tmp_path / "moons.tsv"
+    tsv.write_text("1684900.12345\t0\n1684929.5\t0\n")
+    tsv_to_binary(tsv)
+
+    # The tab-delimited file is used if it changed after conversion
+    tsv.write_text("1684900.12345\t1\n1684929.5\t0\n")
+    assert load_events(tsv) == ((1684900.12345, 1), (1684929.5, 0))
+
+    tsv_to_binary(tsv)
+    assert type(load_events(tsv).jd) is memoryview
+    assert load_events(tsv) == ((1684900.12345, 1), (1684929.5, 0))
+
+
+def test_load_events_binary_written_first(tmp_path):
+    # As when a package is installed, the binary file may be written
+    # before the tab-delimited file it was converted from
+    text = "1684900.12345\t0\n1684929.5\t0\n"
+    (tmp_path / "src.tsv").write_text(text)
+    tsv_to_binary(tmp_path / "src.tsv", tmp_path / "moons.bin")
+    (tmp_path / "moons.tsv").write_text(text)
+
+    assert type(load_events(tmp_path / "moons.tsv").jd) is memoryview
+    assert load_events(tmp_path / "moons.tsv") == ((1684900.12345, 0), (1684929.5, 0))
+
+    for fn in ("solstices", "new_moons"):
+        assert type(load_events(DATA / f"{fn}.tsv").jd) is memoryview
+
+
+def test_year_indices():
+    import juliandate as jd
+
+    table = load_events(DATA / "solstices.tsv")
+    for year in (-633, -632, -431, 0, 1, 1898, 1899, 2000, 2152, 2153):
+        d1 = jd.from_julian(year, 1, 1)
+        d2 = jd.from_julian(year, 12, 31, 23, 59, 59)
+        expected = [s for s in table if d1 <= s[0] <= d2]
+        assert list(table.year(year)) == expected
+
+
+def test_unsorted_legacy_data():
+    assert new_moons(-99, data={"new_moons": ((1684929.5, 0), (1684900.12345, 0))}) == (
+        1684900.12345,
+        1684929.5,
+    )
+
+
+def test_astro_data():
+    d = AstroData.coerce(CUSTOM)
+    assert isinstance(d, AstroData)
+    assert AstroData.coerce(d) is d
+    assert d["solstices"] == CUSTOM["solstices"]
+    assert d.new_moons == CUSTOM["new_moons"]
+    assert "solstices" in d
+    assert sorted(d.keys()) == ["new_moons", "solstices"]
+    assert d.year_range == (-99, -99)
+    assert AstroData().year_range is None
+
+    with pytest.raises(KeyError):
+        d["full_moons"]
+
+
+def test_astro_data_events():
+    d = load_data()
+    summer = d.events("solstices", Seasons.SUMMER_SOLSTICE)
+    assert all([e == Seasons.SUMMER_SOLSTICE for e in summer.event])
+    assert len(summer) == len(
+        [s for s in d.solstices if s[1] == Seasons.SUMMER_SOLSTICE]
+    )
+    assert d.events("solstices", Seasons.SUMMER_SOLSTICE) is summer
+
+
+def test_astro_data_key():
+    import pickle
+
+    d = AstroData.coerce(CUSTOM)
+    assert d == AstroData.coerce(CUSTOM)
+    assert hash(d) == hash(AstroData.coerce(CUSTOM))
+    assert d != AstroData.coerce({"solstices": CUSTOM["solstices"]})
+    assert len({d: 1, AstroData.coerce(CUSTOM): 2}) == 1
+
+    default = load_data()
+    assert pickle.loads(pickle.dumps(default)) == default
+    assert default.key != d.key
+
+
+def test_coerce_remembers_dicts():
+    data = dict(CUSTOM)
+    d = AstroData.coerce(data)
+    assert AstroData.coerce(data) is d
+
+    # Replacing one kind of data is noticed
+    data["new_moons"] = CUSTOM["new_moons"][:1]
+    assert AstroData.coerce(data) is not d
+    assert AstroData.coerce(data).new_moons == CUSTOM["new_moons"][:1]
+
+    others = [dict(CUSTOM) for _ in range(AstroData.COERCE_CACHE_SIZE * 2)]
+    for other in others:
+        AstroData.coerce(other)
+    assert len(AstroData._coerced) == AstroData.COERCE_CACHE_SIZE
+    assert AstroData.coerce(others[-1]) is AstroData.coerce(others[-1])
+
+
+def test_legacy_dict_data():
+    assert festival_calendar(-99, data=load_data()) == festival_calendar(
+        -99, data={k: tuple(v) for k, v in load_data().items()}
+    )
+
+
+def test_new_moon_jdns():
+    d = load_data()
+    assert len(d.new_moon_jdns) == len(d.new_moons)
+    assert all([j == to_jdn(t) for j, t in zip(d.new_moon_jdns, d.new_moons.jd)])
+    assert d.new_moon_jdns is d.new_moon_jdns
+
+    for v_off in range(-1, 4):
+        assert visible_new_moons(-431, v_off) == tuple(
+            [to_jdn(n) + v_off for n in new_moons(-431)]
+        )
@@ -0,0 +1,118 @@
+from heniautos import *
+import os
+import pytest
+
+# Ephemeris tests need skyfield and an ephemeris file covering
+# 1990-2019. Run with --runeph and set EPH to the path of the file.
+EPH = os.environ.get("EPH", "de421.bsp")
+
+
+@pytest.fixture(scope="module")
+def eph():
+    heph = pytest.importorskip("heniautos.ephemeris")
+    return heph.init_ephemeris({}, eph=EPH)
+
+
+@pytest.mark.eph
+def test_ephemeris_matches_data(eph):
+    import heniautos.ephemeris as heph
+
+    d = heph.get_ephemeris_data(2000, 2008, eph)
+    assert d.year_range == (1999, 2009)
+
+    for year in range(1999, 2010):
+        assert new_moons(year, data=d) == pytest.approx(new_moons(year), abs=1e-5)
+        for s in Seasons:
+            assert solar_event(year, s, data=d) == pytest.approx(
+                solar_event(year, s), abs=1e-5
+            )
+
+
+@pytest.mark.eph
+def test_ephemeris_cache(eph, tmp_path):
+    import heniautos.ephemeris as heph
+
+    uncached = heph.get_ephemeris_data(2000, 2002, eph)
+    cached = heph.get_ephemeris_data(2000, 2002, eph, cache_dir=tmp_path)
+    assert cached == uncached
+
+    # One directory for this ephemeris, containing blocks for each kind
+    (cache,) = tmp_path.iterdir()
+    assert sorted([f.name for f in cache.iterdir()]) == [
+        "new_moons_1990.bin",
+        "new_moons_2000.bin",
+        "solstices_1990.bin",
+        "solstices_2000.bin",
+    ]
+
+    assert heph.get_ephemeris_data(2000, 2002, eph, cache_dir=tmp_path) == uncached
+
+    # Overlapping span reuses cached blocks
+    overlap = heph.get_ephemeris_data(2001, 2004, eph, cache_dir=tmp_path)
+    assert len(list(cache.iterdir())) == 4
+    assert overlap.new_moons.year(2002) == uncached.new_moons.year(2002)
+
+    # ΔT is part of the cache key
+    heph.get_ephemeris_data(2000, 2002, eph, delta_t=False, cache_dir=tmp_path)
+    assert len(list(tmp_path.iterdir())) == 2
+
+
+@pytest.mark.eph
+def test_ephemeris_workers(eph, tmp_path):
+    import heniautos.ephemeris as heph
+
+    serial = heph.get_ephemeris_data(1995, 2015, eph)
+    parallel = heph.get_ephemeris_data(1995, 2015, eph, workers=3)
+    assert list(parallel.new_moons.jd) == list(serial.new_moons.jd)
+    assert list(parallel.solstices.jd) == list(serial.solstices.jd)
+    assert list(parallel.solstices.event) == list(serial.solstices.event)
+
+    cached = heph.get_ephemeris_data(1995, 2015, eph, cache_dir=tmp_path, workers=3)
+    assert cached == serial
+
+
+@pytest.mark.eph
+def test_moon_phases_match_almanac(eph):
+    import heniautos.ephemeris as heph
+    import juliandate as jd
+    from skyfield import almanac
+
+    t, p = almanac.find_discrete(
+        eph["ts"].tt_jd(jd.from_julian(2000, 1, 1)),
+        eph["ts"].tt_jd(jd.from_julian(2003, 1, 1)),
+        almanac.moon_phases(eph["eph"]),
+    )
+
+    for phase in heph.Phases:
+        expected = [e.tt for e, ep in zip(t, p) if ep == phase]
+        found = heph._moon_phases(2000, 2002, eph, phase, delta_t=False)
+        assert [f[1] for f in found] == [phase] * len(expected)
+        assert [f[0] for f in found] == pytest.approx(expected, abs=1e-7)
+
+
+@pytest.mark.eph
+def test_ephemeris_ends(eph, tmp_path):
+    import heniautos.ephemeris as heph
+    import juliandate as jd
+    from skyfield.errors import EphemerisRangeError
+
+    # The first and last years for which data (including the years
+    # before and after) is covered by the ephemeris
+    first, last = heph._coverage(eph)
+    year1 = jd.to_julian(first)[0] + 2
+    year2 = jd.to_julian(last)[0] - 2
+
+    for years in ((year1, year1 + 4), (year2 - 4, year2), (year2,)):
+        d = heph.get_ephemeris_data(*years, eph=eph)
+        assert d.year_range == (years[0] - 1, years[-1] + 1)
+        assert heph.get_ephemeris_data(*years, eph=eph, cache_dir=tmp_path) == d
+
+        for year in range(years[0] - 1, years[-1] + 2):
+            assert len(d.solstices.year(year)) == 4
+            assert len(d.new_moons.year(year)) in (12, 13)
+
+    with pytest.raises(EphemerisRangeError):
+        heph.get_ephemeris_data(year1 - 1, eph=eph)
+
+    with pytest.raises(EphemerisRangeError):
+        heph.get_ephemeris_data(year2 + 1, eph=eph)
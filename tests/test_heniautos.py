@@ -500,6 +500,146 @@ def test_find_jdn_argos():
     assert day.day == 1
 
 
+def test_find_jdn_every_day():
+    for cal in (Cal.ATHENIAN, Cal.DELIAN, Cal.SPARTAN):
+        for y in (-408, -407):
+            for d in CAL_FUNCTION_MAP[cal](y):
+                assert jdn_to_festival_day(d.jdn, calendar=cal) == d
+
+
+def test_find_jdn_not_found():
+    with pytest.raises(HeniautosDateNotFoundError):
+        jdn_to_festival_day(1572957, -300)
+
+    assert jdn_to_festival_calendar(1572957, -300) == ()
+
+
+def test_jdns_to_festival_days():
+    jdns = [1572957, 1500000, 1572958, 1572957, 1573400, 1]
+    days = jdns_to_festival_days(jdns)
+
+    assert days[0] == jdn_to_festival_day(1572957)
+    assert days[1] == jdn_to_festival_day(1500000)
+    assert days[2] == jdn_to_festival_day(1572958)
+    assert days[3] == days[0]
+    assert days[4] == jdn_to_festival_day(1573400)
+    assert days[5] is None
+
+    assert jdns_to_festival_days([]) == []
+
+
+def test_jdns_to_festival_days_columns():
+    cols = jdns_to_festival_days([1572957, 1], calendar=Cal.ARGIVE, columns=True)
+
+    assert list(cols) == list(FestivalDay._fields)
+    assert cols["month"] == [ArgiveMonths.PAN, None]
+    assert cols["day"] == [1, None]
+
+
+def test_cal_rules():
+    for cal, func in CAL_FUNCTION_MAP.items():
+        event, before_event = CAL_RULES[cal]
+        assert func(-406, 6) == festival_calendar(
+            -406, cal, 6, event=event, before_event=before_event
+        )
+
+
+def test_calendar_sweep():
+    sweep = calendar_sweep(
+        -101,
+        -98,
+        v_off=(0, 1, 2),
+        s_off=(0, 1),
+        before_event=(False, True),
+        event=(Seasons.SUMMER_SOLSTICE, Seasons.AUTUMN_EQUINOX),
+    )
+
+    assert len(sweep) == 24
+    assert list(sweep)[1] == (Seasons.SUMMER_SOLSTICE, False, 0, 1)
+
+    for (event, before_event, v_off, s_off), years in sweep.items():
+        assert list(years.years) == [-101, -100, -99, -98]
+
+        for i, year in enumerate(years.years):
+            cal = festival_calendar(
+                year, event=event, before_event=before_event, v_off=v_off, s_off=s_off
+            )
+            assert years.starts[i] == cal[0].jdn
+            assert years.lengths[i] == len(cal)
+            assert years.intercalary[i] == (cal[-1].month_index == 13)
+
+    assert sweep[(Seasons.SUMMER_SOLSTICE, False, 1, 0)].intercalary == (
+        True,
+        False,
+        True,
+        False,
+    )
+
+
+def test_calendar_sweep_workers():
+    params = dict(v_off=range(3), s_off=range(2), before_event=(False, True))
+    assert calendar_sweep(-410, -400, workers=2, **params) == calendar_sweep(
+        -410, -400, **params
+    )
+
+
+def test_calendar_sweep_iterators():
+    params = dict(
+        v_off=(0, 1),
+        s_off=(0, 1),
+        before_event=(False, True),
+        event=(Seasons.SUMMER_SOLSTICE, Seasons.WINTER_SOLSTICE),
+    )
+    sweep = calendar_sweep(-410, -400, **{k: iter(v) for k, v in params.items()})
+
+    assert len(sweep) == 16
+    assert sweep == calendar_sweep(-410, -400, **params)
+
+
+def test_calendar_sweep_errors():
+    with pytest.raises(ValueError):
+        calendar_sweep(-98, -99)
+
+    with pytest.raises(HeniautosNoDataError):
+        calendar_sweep(-3, 2)
+
+    # No new moon before the autumn equinox of the first year
+    from tests.test_loading_data import truncated_data
+
+    equinox = solar_event(-520, Seasons.AUTUMN_EQUINOX)
+    data = truncated_data(-520, -500, moons_after=equinox)
+    params = dict(before_event=(True,), event=(Seasons.AUTUMN_EQUINOX,))
+    with pytest.raises(HeniautosNoDataError):
+        calendar_sweep(-520, -519, data=data, **params)
+
+    assert calendar_sweep(-515, -514, data=data, **params) == calendar_sweep(
+        -515, -514, **params
+    )
+
+
+def test_calendars_share_months():
+    # Calendars that begin the year at the same solar event have the
+    # same months under different names
+    for cal in (Cal.DELPHIAN, Cal.GENERIC):
+        assert [
+            (d.jdn, d.month_index, d.day) for d in athenian_festival_calendar(-99)
+        ] == [(d.jdn, d.month_index, d.day) for d in festival_calendar(-99, cal)]
+
+    argive = next(
+        festival_calendars(
+            -99, -99, Cal.ARGIVE, event=Seasons.AUTUMN_EQUINOX, before_event=True
+        )
+    )
+    for cal in (Cal.CORINTHIAN, Cal.SPARTAN):
+        year = next(
+            festival_calendars(
+                -99, -99, cal, event=Seasons.AUTUMN_EQUINOX, before_event=True
+            )
+        )
+        assert year.starts == argive.starts
+        assert year.month_names != argive.month_names
+
+
 def test_to_jd():
     # From test for removed find_festival_date()
     d = festival_to_jdn(-406, 1, 1)
@@ -510,6 +650,38 @@ def test_to_jd():
         festival_to_jdn(-406, 1, 30)
 
 
+def test_festival_to_jdn_every_day():
+    for year in (-99, -98):
+        for cal, (event, before_event) in CAL_RULES.items():
+            for d in festival_calendar(
+                year, cal, event=event, before_event=before_event
+            ):
+                assert d.jdn == festival_to_jdn(
+                    year,
+                    d.month,
+                    d.day,
+                    calendar=cal,
+                    event=event,
+                    before_event=before_event,
+                )
+
+
+def test_festival_to_jdn_no_day():
+    # Day 0 and days past the end of the month
+    for day in (0, 31):
+        with pytest.raises(HeniautosNoDayInYearError):
+            festival_to_jdn(-99, AthenianMonths.HEK, day)
+
+    # No intercalary month in an ordinary year
+    assert festival_to_jdn(-99, Months.INT, 1) == 1685262
+    with pytest.raises(HeniautosNoDayInYearError):
+        festival_to_jdn(-98, Months.INT, 1)
+
+    # No month constants without a calendar
+    with pytest.raises(HeniautosNoDayInYearError):
+        festival_to_jdn(-98, 1, 1, calendar=None)
+
+
 def test_julian_to_festival_day():
     d = julian_to_festival_day(-406, 7, 10)
     assert d.jdn == 1572957
@@ -569,8 +741,192 @@ def test_octaeteris_rollover():
     oct = octaeteris(9, -432, -423, calendar=Cal.ATHENIAN)
     assert len(oct) == 10
     assert [len(y) < 356 for y in oct] == [True, True, False, True, False, True, True, False, True, True]
-    
+
+
+def test_octaeteris_long():
+    oct = octaeteris(1, -630, -2, calendar=Cal.ATHENIAN)
+    assert len(oct) == 629
+    assert [len(by_months(y)) for y in oct[:8]] == [12, 12, 13, 12, 13, 12, 12, 13]
+    assert all([y2[0].jdn == y1[-1].jdn + 1 for y1, y2 in zip(oct, oct[1:])])
+    assert oct[-1][0].astronomical_year == -2
+
+
+def test_octaeteris_calendars():
+    years = octaeteris_calendars(3, -432, -423, calendar=Cal.ATHENIAN)
+    first = next(years)
+    assert isinstance(first, FestivalYear)
+    assert len(first.months) == 13
+
+    oct = (first,) + tuple(years)
+    assert oct == octaeteris(3, -432, -423, calendar=Cal.ATHENIAN)
+    assert [len(y) < 356 for y in oct] == [False, True, False, True, True, False, True, True, False, True]
+
+
+def test_octaeteris_calendars_no_data():
+    years = octaeteris_calendars(1, 2140, 2160)
+    assert next(years) == octaeteris(1, 2140)[0]
+
+    with pytest.raises(HeniautosNoDataError):
+        list(years)
+
+
+def test_doy_gen():
+    from itertools import islice
+
+    assert list(islice(doy_gen(), 3)) == [1, 2, 3]
+    assert list(islice(doy_gen(5), 3)) == [5, 6, 7]
+    assert list(islice(doy_gen(), 10000))[-1] == 10000
+
 
 def test_posideon():
     assert month_name(AthenianMonths.POS) == "Posideṓn"
     assert month_name(AthenianMonths.POS, name_as=MonthNameOptions.GREEK) == "Ποσιδεών"
+
+
+@pytest.fixture
+def festival_cache():
+    enable_festival_cache(maxsize=2)
+    yield
+    disable_festival_cache()
+
+
+def test_festival_cache_disabled():
+    assert festival_cache_info() == (0, 0, 0, 0)
+    assert festival_calendar(-99) == festival_calendar(-99)
+    assert festival_cache_info() == (0, 0, 0, 0)
+
+
+def test_festival_cache(festival_cache):
+    c1 = festival_calendar(-99, Cal.ATHENIAN)
+    assert festival_cache_info() == (0, 1, 2, 1)
+
+    c2 = festival_calendar(-99, Cal.ATHENIAN)
+    assert c2 is c1
+    assert festival_cache_info() == FestivalCacheInfo(1, 1, 2, 1)
+
+    # Any difference in parameters is a different year
+    assert festival_calendar(-99, Cal.ATHENIAN, v_off=2) is not c1
+    assert festival_calendar(-99, Cal.ATHENIAN) is c1
+    assert festival_cache_info() == (2, 2, 2, 2)
+
+    # Cache is bounded, least recently used is discarded
+    festival_calendar(-100, Cal.ATHENIAN)
+    assert festival_calendar(-99, Cal.ATHENIAN) is c1
+    assert festival_calendar(-99, Cal.ATHENIAN, v_off=2) is not c1
+    assert festival_cache_info() == (3, 4, 2, 2)
+
+    clear_festival_cache()
+    assert festival_cache_info() == (0, 0, 2, 0)
+    assert festival_calendar(-99, Cal.ATHENIAN) == c1
+
+
+def test_festival_cache_data(festival_cache):
+    default = festival_calendar(-99)
+    custom = load_data()
+    custom = AstroData(custom.solstices, custom.new_moons[1:])
+
+    # Same data, different object
+    assert festival_calendar(-99, data=dict(load_data())) is default
+    assert festival_calendar(-99, data=custom) is not default
+    assert festival_cache_info().currsize == 2
+
+
+def test_clear_festival_cache_starts():
+    from concurrent.futures import ThreadPoolExecutor
+    import heniautos.heniautos as hh
+
+    params = [(y, v) for y in range(-120, -99) for v in (0, 1)]
+    expected = [festival_calendar(y, v_off=v) for y, v in params]
+
+    clear_festival_cache()
+    assert not len(vars(hh)["__year_starts"]) and not len(vars(hh)["__month_starts"])
+
+    # Starts are found again, safely from many threads at once
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        years = ex.map(lambda p: festival_calendar(p[0], v_off=p[1]), params)
+        assert list(years) == expected
+
+
+def test_festival_cache_size():
+    with pytest.raises(ValueError):
+        enable_festival_cache(0)
+
+
+def test_festival_calendars():
+    years = festival_calendars(-110, -99, Cal.ATHENIAN)
+    assert not isinstance(years, (tuple, list))
+
+    cals = list(years)
+    assert len(cals) == 12
+    assert cals == [festival_calendar(y, Cal.ATHENIAN) for y in range(-110, -98)]
+
+    # Each year begins the day after the previous one ends
+    for c1, c2 in zip(cals, cals[1:]):
+        assert c2[0].jdn == c1[-1].jdn + 1
+
+
+def test_festival_calendars_params():
+    params = {
+        "event": Seasons.AUTUMN_EQUINOX,
+        "before_event": True,
+        "v_off": 0,
+        "s_off": 1,
+    }
+
+    assert list(festival_calendars(-405, -400, Cal.SPARTAN, **params)) == [
+        festival_calendar(y, Cal.SPARTAN, **params) for y in range(-405, -399)
+    ]
+
+
+def test_festival_calendars_no_data():
+    years = festival_calendars(2148, 2152)
+    assert next(years) == festival_calendar(2148)
+
+    with pytest.raises(HeniautosNoDataError):
+        list(years)
+
+
+def test_festival_year():
+    fy = next(festival_calendars(-98, -98, Cal.ATHENIAN))
+    fc = festival_calendar(-98, Cal.ATHENIAN)
+
+    assert isinstance(fy, FestivalYear)
+    assert len(fy) == len(fc) == 355
+    assert fy == fc
+    assert tuple(fy) == fc
+    assert fy[0] == fc[0]
+    assert fy[29] == fc[29]
+    assert fy[-1] == fc[-1]
+    assert fy[100:110] == fc[100:110]
+    assert fy.index(fc[200]) == 200
+    assert fy.year == "BCE 99/98"
+    assert fy.astronomical_year == -98
+    assert fy.months == tuple(AthenianMonths)
+    assert by_months(fy) == by_months(fc)
+
+    with pytest.raises(IndexError):
+        fy[355]
+
+
+def test_festival_year_generic():
+    fy = next(festival_calendars(-99, -99, None))
+    assert fy == festival_calendar(-99, None)
+    assert fy[0].month is None
+    assert fy[0].year is None
+
+
+def test_festival_year_intercalary():
+    fy = next(
+        festival_calendars(-99, -99, Cal.ATHENIAN, name_as=MonthNameOptions.GREEK)
+    )
+    assert len(fy) == 384
+    assert fy.months[6] == Months.INT
+    assert fy.month_names[6] == "Ποσιδεών ὕστερος"
+    assert fy == festival_calendar(-99, Cal.ATHENIAN, name_as=MonthNameOptions.GREEK)
+
+
+def test_festival_year_pickle():
+    import pickle
+
+    fy = next(festival_calendars(-99, -99, Cal.ATHENIAN))
+    assert pickle.loads(pickle.dumps(fy)) == fy
@@ -0,0 +1,65 @@
+import subprocess
+import sys
+import types
+import heniautos as ha
+
+
+def imported_after(code):
+    """Return the heniautos modules loaded by running code in a new process."""
+    out = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            f"import sys\n{code}\n"
+            "print(' '.join(m for m in sys.modules if m.startswith('heniautos')))",
+        ],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    return out.stdout.split()
+
+
+def test_import_is_lazy():
+    assert set(imported_after("import heniautos")) == {
+        "heniautos",
+        "heniautos.__version__",
+    }
+
+
+def test_version_is_lazy():
+    assert "heniautos.heniautos" not in imported_after(
+        "import heniautos.command_line\n"
+        "import heniautos.calendar_equation\n"
+        "import heniautos\n"
+        "heniautos.__version__"
+    )
+
+
+def test_attribute_loads_module():
+    assert "heniautos.heniautos" in imported_after(
+        "import heniautos\nheniautos.festival_calendar"
+    )
+
+
+def test_all_is_complete():
+    import heniautos.heniautos as module
+
+    public = {
+        k
+        for k, v in vars(module).items()
+        if not k.startswith("_")
+        and not isinstance(v, types.ModuleType)
+        and getattr(v, "__module__", module.__name__) == module.__name__
+    }
+
+    assert public == set(ha.__all__) - {"AstroData"}
+    assert ha.version() == ha.__version__
+
+
+def test_star_import():
+    ns = {}
+    exec("from heniautos import *", ns)
+
+    assert ns["festival_calendar"] is ha.festival_calendar
+    assert ns["AstroData"] is ha.AstroData
@@ -21,7 +21,7 @@ CUSTOM_YEAR = {
 
 def test_load_default_data():
     d = load_data()
-    assert type(d) is dict
+    assert isinstance(d, AstroData)
     assert "solstices" in d
     assert "new_moons" in d
 
@@ -180,3 +180,99 @@ def test_festival_to_julian_data_param():
 
     with pytest.raises(HeniautosNoDataError):
         festival_to_jdn(-99, 1, 10, data={"solstices": (), "new_moons": ()})
+
+
+def truncated_data(year1, year2, moons_after=None):
+    """The default data for year1 to year2, optionally without the new
+    moons before the Julian date moons_after"""
+    d = load_data()
+    solstices = d.solstices[
+        d.solstices.year_indices(year1)[0] : d.solstices.year_indices(year2)[1]
+    ]
+    moons = d.new_moons[
+        d.new_moons.year_indices(year1)[0] : d.new_moons.year_indices(year2)[1]
+    ]
+
+    if moons_after is not None:
+        moons = [m for m in moons if m[0] > moons_after]
+
+    return AstroData(solstices, moons)
+
+
+def test_jdn_to_festival_day_truncated_data():
+    data = truncated_data(-520, -500)
+
+    assert julian_to_festival_day(-510, 1, 5, Cal.DELIAN, data=data) == (
+        julian_to_festival_day(-510, 1, 5, Cal.DELIAN)
+    )
+
+    # After the last new moon
+    with pytest.raises(HeniautosNoDataError):
+        julian_to_festival_day(-500, 12, 28, Cal.DELIAN, data=data)
+
+
+def test_jdns_to_festival_days_truncated_data():
+    data = truncated_data(-520, -500)
+
+    # The last is after the last new moon in the data
+    jdns = [1534785, 1531498, 1538795]
+    days = jdns_to_festival_days(jdns, Cal.DELIAN, data=data)
+
+    assert days[:2] == jdns_to_festival_days(jdns[:2], Cal.DELIAN)
+    assert days[2] is None
+
+
+def test_before_event_without_earlier_moon():
+    # No new moon before the autumn equinox that begins the year
+    data = truncated_data(
+        -520, -500, moons_after=solar_event(-520, Seasons.AUTUMN_EQUINOX)
+    )
+
+    with pytest.raises(HeniautosNoDataError):
+        spartan_festival_calendar(-520, data=data)
+
+    assert spartan_festival_calendar(-515, data=data) == (
+        spartan_festival_calendar(-515)
+    )
+
+
+def test_load_data_is_cached():
+    d1 = load_data()
+    d2 = load_data()
+    assert d1 is d2
+    assert d1["new_moons"] is d2["new_moons"]
+    assert d1["solstices"] is d2["solstices"]
+
+
+def test_load_data_threads():
+    from concurrent.futures import ThreadPoolExecutor
+
+    clear_data_cache()
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        loaded = list(ex.map(lambda _: load_data(), range(16)))
+
+    assert all([d["new_moons"] is loaded[0]["new_moons"] for d in loaded])
+
+
+def test_clear_data_cache():
+    d1 = load_data()
+    clear_data_cache()
+    d2 = load_data()
+    assert d1["new_moons"] is not d2["new_moons"]
+    assert d1["new_moons"] == d2["new_moons"]
+
+
+def test_set_data_files(tmp_path):
+    sol = tmp_path / "solstices.tsv"
+    sol.write_text("1685074.12345\t1\n")
+    nm = tmp_path / "new_moons.tsv"
+    nm.write_text("1684900.12345\t0\n")
+
+    try:
+        set_data_files(sol, nm)
+        assert solar_event(-99, Seasons.SUMMER_SOLSTICE) == 1685074.12345
+        assert new_moons(-99) == (1684900.12345,)
+    finally:
+        set_data_files()
+
+    assert solar_event(-99, Seasons.SUMMER_SOLSTICE) == 1685074.1951805085
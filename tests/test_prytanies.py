@@ -1,5 +1,6 @@
 from heniautos import *
 from heniautos.prytanies import *
+import heniautos.prytanies as prytanies
 import pytest
 
 # Year to test prytany lengths
@@ -238,6 +239,23 @@ def test_prytany_calendar_solar_supplied_jdn():
     assert prytany_calendar(-420, pryt_start=1572962)[0].jdn == 1567838
 
 
+def test_prytany_calendar_solar_years():
+    # Quasi-solar years are 366 days, each beginning the day after the
+    # previous one ends
+    for v_off in (0, 1):
+        anchor = festival_to_jdn(-406, 1, 1, v_off=v_off)
+        end = None
+        for year in range(-507, -374):
+            p = prytany_calendar(year, v_off=v_off)
+            assert len(p) == 366
+            assert end is None or p[0].jdn == end + 1
+            assert [len(d) for d in by_prytanies(p)] == [37] * 6 + [36] * 4
+            end = p[-1].jdn
+
+            if year == -406:
+                assert p[0].jdn == anchor
+
+
 def test_prytany_calendar_solar_leap():
     p = by_prytanies(prytany_calendar(-417))
 
@@ -509,6 +527,67 @@ def test_jdn_to_prytany_without_year_hint():
     assert day.year == "BCE 407/406"
 
 
+def test_jdn_to_prytany_every_day():
+    for year in (-420, -417, -375, -369, -291, -214, -209):
+        for kw in ({}, dict(v_off=0, rule_of_aristotle=True)):
+            for d in prytany_calendar(year, **kw):
+                assert jdn_to_prytany_day(d.jdn, year, **kw) == d
+
+
+def test_jdn_to_prytany_not_found():
+    with pytest.raises(HeniautosDateNotFoundError):
+        jdn_to_prytany_day(1572957, -300)
+
+
+def test_prytany_bounds_cache():
+    from concurrent.futures import ThreadPoolExecutor
+
+    year_bounds = vars(prytanies)["__year_bounds"]
+    params = [(y, a) for y in range(-420, -400) for a in (False, True)]
+    expected = [prytany_calendar(y, rule_of_aristotle=a) for y, a in params]
+
+    # Explicit starts are not kept
+    keys = {k for v in year_bounds.values() for k in v}
+    prytany_calendar(-420, pryt_start=1572952)
+    assert {k for v in year_bounds.values() for k in v} == keys
+
+    clear_festival_cache()
+    assert not len(year_bounds) and not len(vars(prytanies)["__quasi_solar_anchors"])
+
+    # Boundaries are found again, safely from many threads at once
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        years = ex.map(lambda p: prytany_calendar(p[0], rule_of_aristotle=p[1]), params)
+        assert list(years) == expected
+
+
+def test_jdns_to_prytany_days():
+    jdns = list(range(1572000, 1575000, 7))
+    days = jdns_to_prytany_days(jdns[::-1] + [5])
+
+    assert days[:-1] == [jdn_to_prytany_day(j) for j in jdns[::-1]]
+    assert days[-1] is None
+
+    cols = jdns_to_prytany_days([1572957, 5, 1572957], columns=True)
+    assert cols["jdn"] == [1572957, None, 1572957]
+    assert cols["prytany"] == [Prytanies.I, None, Prytanies.I]
+    assert cols["year"] == ["BCE 407/406", None, "BCE 407/406"]
+
+
+def test_prytany_calendars():
+    years = list(prytany_calendars(-377, -372))
+    assert len(years) == 6
+
+    for year, cal in zip(range(-377, -371), years):
+        assert cal == prytany_calendar(year)
+
+    for year, cols in zip(
+        range(-377, -371), prytany_calendars(-377, -372, columns=True)
+    ):
+        assert [PrytanyDay(*d) for d in zip(*cols.values())] == list(
+            prytany_calendar(year)
+        )
+
+
 def test_julian_to_prytany():
     d = julian_to_prytany_day(-406, 7, 10)
     assert d.jdn == 1572957
@@ -534,3 +613,89 @@ def test_prytany_day():
     assert d.year == "BCE 407/406"
     assert d.year_length == 366
     assert d.astronomical_year == -406
+
+
+# The recursive implementation of prytany boundaries that
+# _pryt_bounds replaced, for comparison
+def recursive_pryt_len(days, count=4):
+    if count:
+        yield days
+        yield from recursive_pryt_len(days, count - 1)
+
+    if count == 0:
+        yield from recursive_pryt_len(days - 1, count - 1)
+
+    yield from recursive_pryt_len(days, count)
+
+
+def recursive_pryt_len_festival(cal):
+    if len(cal) == 0:
+        return
+
+    yield cal[0][1] - cal[0][0]
+    yield from recursive_pryt_len_festival(cal[1:])
+
+
+def recursive_pryt_gen(start, end, length, num=10, count=1):
+    if count == num:
+        yield (start, end)
+        return
+
+    p_end = start + next(length)
+    yield (start, p_end)
+    yield from recursive_pryt_gen(p_end, end, length, num, count + 1)
+
+
+def recursive_pryt_bounds(year, pryt_type, rule_of_aristotle):
+    if pryt_type == Prytany.QUASI_SOLAR:
+        start = prytanies._pryt_auto_start(year)
+        pryt = recursive_pryt_gen(start, start + 366, recursive_pryt_len(37, 6))
+    else:
+        cal = calendar_months(year, load_data())
+        y_len = sum([m[1] - m[0] for m in cal])
+        start, end = cal[0][0], cal[-1][1]
+
+        if pryt_type == Prytany.ALIGNED_10:
+            length = recursive_pryt_len(39 if y_len > 355 else 36)
+            pryt = recursive_pryt_gen(start, end, length)
+        elif pryt_type == Prytany.ALIGNED_12:
+            if y_len > 355 or rule_of_aristotle:
+                length = recursive_pryt_len(*((33, 0) if y_len > 355 else (30, 6)))
+            else:
+                length = recursive_pryt_len_festival(cal)
+            pryt = recursive_pryt_gen(start, end, length, 12)
+        else:
+            if y_len > 355 and not rule_of_aristotle:
+                length = recursive_pryt_len_festival(cal)
+            else:
+                length = recursive_pryt_len(*((30, 7) if y_len > 355 else (28, 3)))
+            pryt = recursive_pryt_gen(start, end, length, 13)
+
+    pryt = list(pryt)
+    return [p[0] for p in pryt] + [pryt[-1][1]]
+
+
+def test_pryt_bounds_match_recursive():
+    # Every year in the data, for every type of prytany
+    first, last = load_data().year_range
+
+    for year in range(first, last + 1):
+        for pryt_type in list(Prytany)[1:]:
+            for rule_of_aristotle in (False, True):
+                try:
+                    expected = recursive_pryt_bounds(
+                        year, pryt_type, rule_of_aristotle
+                    )
+                except HeniautosNoDataError:
+                    with pytest.raises(HeniautosNoDataError):
+                        prytanies._pryt_bounds(year, pryt_type)
+                    continue
+
+                assert (
+                    list(
+                        prytanies._pryt_bounds(
+                            year, pryt_type, rule_of_aristotle=rule_of_aristotle
+                        )
+                    )
+                    == expected
+                )
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+
+"""Time the startup of the command line programs.
+
+Each command is run repeatedly in a new process and the best time is
+reported. With --max, exit with an error if any command is slower, to
+catch regressions in import time.
+"""
+
+import argparse
+import subprocess
+import sys
+import time
+
+COMMANDS = {
+    "import": [sys.executable, "-c", "import heniautos"],
+    "heniautos --version": [sys.executable, "-m", "heniautos", "--version"],
+    "calendar-equation --version": [
+        sys.executable,
+        "-m",
+        "heniautos.calendar_equation",
+        "--version",
+    ],
+    "heniautos 400": [sys.executable, "-m", "heniautos", "400"],
+    "python (baseline)": [sys.executable, "-c", "pass"],
+}
+
+
+def best_time(cmd, runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(cmd, stdout=subprocess.DEVNULL, check=True)
+        times.append(time.perf_counter() - start)
+
+    return min(times)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        prog="bench_import.py",
+        description="Time the startup of the heniautos command line programs",
+    )
+    parser.add_argument(
+        "-n",
+        "--runs",
+        type=int,
+        default=20,
+        help="Number of times to run each command (default: 20)",
+    )
+    parser.add_argument(
+        "--max",
+        metavar="MS",
+        type=float,
+        help="Fail if any --version command takes longer than MS milliseconds",
+    )
+    args = parser.parse_args()
+
+    failed = False
+    for name, cmd in COMMANDS.items():
+        ms = best_time(cmd, args.runs) * 1000
+        print(f"{name:30} {ms:8.1f} ms")
+
+        if args.max is not None and name.endswith("--version") and ms > args.max:
+            failed = True
+
+    if failed:
+        sys.exit(f"Startup slower than {args.max} ms")
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+
+"""Show how the time to generate calendars grows with the number of years.
+
+For each span the time per year should stay about the same. A time per
+year that grows with the span means something is doing more than
+linear work.
+"""
+
+import argparse
+from itertools import islice
+import time
+import heniautos as ha
+
+
+def best_time(f, runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        f()
+        times.append(time.perf_counter() - start)
+
+    return min(times)
+
+
+BENCHMARKS = {
+    "octaeteris": lambda y1, y2: ha.octaeteris(1, y1, y2, ha.Cal.ATHENIAN),
+    "festival_calendars": lambda y1, y2: list(
+        ha.festival_calendars(y1, y2, ha.Cal.ATHENIAN)
+    ),
+    "doy_gen": lambda y1, y2: list(islice(ha.doy_gen(), (y2 - y1 + 1) * 385)),
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        prog="bench_scaling.py",
+        description="Time calendar generation over increasing numbers of years",
+    )
+    parser.add_argument(
+        "--start", type=int, default=-600, help="First year (default: -600)"
+    )
+    parser.add_argument(
+        "--spans",
+        type=int,
+        nargs="+",
+        default=(10, 50, 100, 200, 400, 580),
+        help="Numbers of years to time (default: 10 50 100 200 400 580)",
+    )
+    parser.add_argument(
+        "-n", "--runs", type=int, default=3, help="Runs of each (default: 3)"
+    )
+    args = parser.parse_args()
+
+    # Load data before timing
+    ha.festival_calendar(args.start)
+
+    print(f"{'':20} {'years':>6} {'total ms':>10} {'ms/year':>8}")
+    for name, f in BENCHMARKS.items():
+        for span in args.spans:
+            secs = best_time(
+                lambda: f(args.start, args.start + span - 1), args.runs
+            )
+            print(f"{name:20} {span:6} {secs * 1000:10.2f} {secs * 1000 / span:8.3f}")
@@ -3,7 +3,10 @@
 import argparse
 import csv
 import heniautos as ha
-import heniautos.ephemeris as heph
+import heniautos.astrodata as had
+import json
+import os
+from pathlib import Path
 import sys
 
 
@@ -19,27 +22,207 @@ def data_key(t):
     raise ValueError(f"Invalid value for data type: {t}")
 
 
+def convert(files):
+    """Write a binary version of each TSV data file beside it."""
+    for fn in files:
+        print(f"{fn} -> {had.tsv_to_binary(fn)}", file=sys.stderr)
+
+
+def year_blocks(first, last, size):
+    """Return (first, last) years of consecutive blocks of size years."""
+    return [(y, min(y + size - 1, last)) for y in range(first, last + 1, size)]
+
+
+def block_data(block, eph, args):
+    """Calculate the data for the years of one block (inclusive)."""
+    import heniautos.ephemeris as heph
+
+    # get_ephemeris_data() includes the years on either side of the
+    # requested span
+    return heph.get_ephemeris_data(
+        block[0] + 1,
+        block[1] - 1,
+        eph,
+        cache_dir=args.cache_dir,
+        workers=args.workers,
+    )
+
+
+def write_rows(f, events):
+    writer = csv.writer(f, delimiter="\t", quoting=csv.QUOTE_NONNUMERIC)
+    for d in events:
+        writer.writerow(d)
+
+    f.flush()
+
+
+def read_checkpoint(fn, run):
+    """Return the saved progress of an interrupted run, or None."""
+    if not fn.exists():
+        return None
+
+    checkpoint = json.loads(fn.read_text())
+    if checkpoint["run"] != run:
+        sys.exit(
+            f"{fn} is a checkpoint for a different run. Remove it to start over."
+        )
+
+    return checkpoint
+
+
+def write_checkpoint(fn, checkpoint):
+    tmp = fn.with_name(fn.name + ".tmp")
+    tmp.write_text(json.dumps(checkpoint))
+    os.replace(tmp, fn)
+
+
+def generate_files(outputs, eph, args):
+    """Calculate data block by block, appending each to the output files.
+
+    After every block the output files are flushed and the number of
+    bytes written is saved to a checkpoint file. If the run is
+    interrupted, running the same command again truncates the output
+    files to the last checkpoint and continues from there.
+    """
+    ckpt = Path(args.checkpoint or f"{next(iter(outputs.values()))}.checkpoint")
+    run = {
+        "start": args.start,
+        "end": args.end,
+        "outputs": {k: str(v) for k, v in outputs.items()},
+    }
+
+    checkpoint = read_checkpoint(ckpt, run)
+    if checkpoint is None:
+        checkpoint = {
+            "run": run,
+            "next": args.start - 1,
+            "sizes": {
+                k: (v.stat().st_size if args.append and v.exists() else 0)
+                for k, v in outputs.items()
+            },
+        }
+    else:
+        print(f"Resuming from {checkpoint['next']}", file=sys.stderr)
+
+    files = {}
+    for k, fn in outputs.items():
+        files[k] = open(fn, "a+" if fn.exists() else "w", newline="")
+        files[k].truncate(checkpoint["sizes"][k])
+        files[k].seek(checkpoint["sizes"][k])
+
+    try:
+        for block in year_blocks(checkpoint["next"], args.end + 1, args.block):
+            data = block_data(block, eph, args)
+            for k, f in files.items():
+                write_rows(f, data[data_key(k)])
+                os.fsync(f.fileno())
+                checkpoint["sizes"][k] = f.tell()
+
+            checkpoint["next"] = block[1] + 1
+            write_checkpoint(ckpt, checkpoint)
+            print(f"Finished {block[0]} to {block[1]}", file=sys.stderr)
+    finally:
+        for f in files.values():
+            f.close()
+
+    ckpt.unlink()
+
+    if args.binary:
+        convert(outputs.values())
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
         prog="gen_astro_data.py",
         description="Generate heniautos TSV data files",
     )
-    parser.add_argument("start", help="First year for generated data", type=int)
-    parser.add_argument("end", help="Last year for generated data", type=int)
-    parser.add_argument("ephemeris", help="path to ephemeris file", type=str)
+    parser.add_argument(
+        "start", help="First year for generated data", type=int, nargs="?"
+    )
+    parser.add_argument("end", help="Last year for generated data", type=int, nargs="?")
+    parser.add_argument(
+        "ephemeris", help="path to ephemeris file", type=str, nargs="?"
+    )
     parser.add_argument(
         "-t",
         "--type",
         choices=("solar", "lunar"),
-        help="Kind of data to export",
-        required="true",
+        help="Kind of data to export to stdout",
+    )
+    parser.add_argument(
+        "--solar", metavar="TSV", type=Path, help="Write solar data to TSV"
+    )
+    parser.add_argument(
+        "--lunar", metavar="TSV", type=Path, help="Write lunar data to TSV"
+    )
+    parser.add_argument(
+        "--append",
+        action="store_true",
+        help="Add to the end of existing --solar and --lunar files",
+    )
+    parser.add_argument(
+        "--binary",
+        action="store_true",
+        help="Also write binary versions of --solar and --lunar files",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        metavar="FILE",
+        help="Progress file for resuming an interrupted run (default: the "
+        "first output file with the suffix .checkpoint)",
+    )
+    parser.add_argument(
+        "--block",
+        metavar="YEARS",
+        type=int,
+        default=50,
+        help="Number of years to calculate and write at a time (default: 50)",
+    )
+    parser.add_argument(
+        "-j",
+        "--workers",
+        metavar="N",
+        type=int,
+        help="Number of processes for calculations",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        metavar="DIR",
+        help="Directory for caching ephemeris calculations",
+    )
+    parser.add_argument(
+        "--convert",
+        metavar="TSV",
+        nargs="+",
+        help="Convert existing TSV data files to the binary format instead "
+        "of generating data",
     )
 
     args = parser.parse_args()
 
+    if args.convert:
+        convert(args.convert)
+        sys.exit()
+
+    if None in (args.start, args.end, args.ephemeris):
+        parser.error("start, end and ephemeris are required")
+
+    if args.type is None and args.solar is None and args.lunar is None:
+        parser.error("one of -t/--type, --solar or --lunar is required")
+
+    import heniautos.ephemeris as heph
+
     e = heph.init_ephemeris(eph=args.ephemeris)
-    data = heph.get_ephemeris_data(args.start, args.end, e)
 
-    writer = csv.writer(sys.stdout, delimiter="\t", quoting=csv.QUOTE_NONNUMERIC)
-    for d in data[data_key(args.type)]:
-        writer.writerow(d)
+    if args.type:
+        # Data for the year before start and after end is included
+        for block in year_blocks(args.start - 1, args.end + 1, args.block):
+            write_rows(sys.stdout, block_data(block, e, args)[data_key(args.type)])
+
+        sys.exit()
+
+    generate_files(
+        {k: v for k, v in (("solar", args.solar), ("lunar", args.lunar)) if v},
+        e,
+        args,
+    )